@@ -4,22 +4,62 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+def _env_int(name, default):
+    """Read an integer setting, falling back to the default if it is not a number"""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+def _env_bool(name, default):
+    """Read a true/false setting"""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ('true', '1', 'yes', 'on')
+
 class Config:
-    """Configuration class for the application"""
+    """
+    Configuration class for the application
+    Settings are read from the environment once, when this module is imported
+    """
     
     # Google Gemini API configuration
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash-exp')  # Default to Gemini 2.5 Flash
+    GEMINI_RPM = _env_int('GEMINI_RPM', 10)  # Requests per minute allowed by the model's quota
+    GEMINI_MAX_CONCURRENCY = _env_int('GEMINI_MAX_CONCURRENCY', 4)  # Credit-scoring batches in flight at once
     
     # Apify API configuration
     APIFY_API_TOKEN = os.getenv('APIFY_API_TOKEN')
+    APIFY_RUN_TIMEOUT = _env_int('APIFY_RUN_TIMEOUT', 3600)  # Max seconds to wait for an actor run
+    APIFY_MAX_RETRIES = _env_int('APIFY_MAX_RETRIES', 3)  # Retries for throttled/failed idempotent calls
+    APIFY_POOL_SIZE = _env_int('APIFY_POOL_SIZE', 50)  # Keep-alive connections to api.apify.com
+    APIFY_MAX_CONCURRENT_RUNS = _env_int('APIFY_MAX_CONCURRENT_RUNS', 10)  # Actor runs a batch search keeps in flight
+    APIFY_CACHE_TTL = _env_int('APIFY_CACHE_TTL', 86400)  # Seconds to reuse search results (0 disables)
+    APIFY_CACHE_PATH = os.getenv('APIFY_CACHE_PATH', '~/.cache/professional_finder/apify_results.sqlite')
     
     # MongoDB configuration
     MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+    MONGODB_MAX_POOL_SIZE = _env_int('MONGODB_MAX_POOL_SIZE', 50)
+    MONGODB_MIN_POOL_SIZE = _env_int('MONGODB_MIN_POOL_SIZE', 5)
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS = _env_int('MONGODB_SERVER_SELECTION_TIMEOUT_MS', 3000)
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS = _env_int('MONGODB_WAIT_QUEUE_TIMEOUT_MS', 2500)  # Wait for a free pooled connection
+    MONGODB_COMPRESSORS = os.getenv('MONGODB_COMPRESSORS', 'zlib')  # e.g. 'zstd,zlib' with zstandard installed
+    MONGODB_WRITE_CONCERN = os.getenv('MONGODB_WRITE_CONCERN', '1').strip()  # a node count or 'majority' (use 'majority' on replica sets)
+    if MONGODB_WRITE_CONCERN.isdigit():
+        MONGODB_WRITE_CONCERN = int(MONGODB_WRITE_CONCERN)
     DATABASE_NAME = 'professional_finder'
     COLLECTION_NAME = 'professionals'
     
     # Application settings
-    MAX_RESULTS = int(os.getenv('MAX_RESULTS', 2500))
+    MAX_RESULTS = _env_int('MAX_RESULTS', 2500)
     US_CITIES_ONLY = True
-    USE_APIFY = os.getenv('USE_APIFY', 'true').lower() == 'true'  # Default to using Apify 
\ No newline at end of file
+    USE_APIFY = _env_bool('USE_APIFY', True)  # Default to using Apify
+    USE_GEMINI_SEARCH = _env_bool('USE_GEMINI_SEARCH', False)  # Also search with Gemini when Apify is used
+    VIEW_CACHE_TTL = _env_int('VIEW_CACHE_TTL', 30)  # Seconds a city view is reused; 0 disables
+    VIEW_PAGE_SIZE = _env_int('VIEW_PAGE_SIZE', 50)  # Professionals per page when viewing all; 0 shows everything at once
@@ -1,121 +1,419 @@
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
-import uuid
-from datetime import datetime
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import IndexModel, MongoClient, ReturnDocument, UpdateOne
+from pymongo.collation import Collation
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError, OperationFailure
+from bson import ObjectId
+from datetime import datetime, timezone
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+# One MongoClient (and connection pool) shared by every DatabaseManager in the process
+_client = None
+_indexes_created = False
+_client_lock = threading.Lock()
+
+# Case-insensitive comparison for city lookups and name/company duplicate checks;
+# queries must pass it to use the city_ci and dedup_ci indexes
+CASE_INSENSITIVE = Collation(locale='en', strength=2)
+
+def _get_client():
+    """Return the shared MongoClient, creating and pinging it on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            client = MongoClient(
+                Config.MONGODB_URI,
+                appname='professional_finder',
+                maxPoolSize=Config.MONGODB_MAX_POOL_SIZE,
+                minPoolSize=Config.MONGODB_MIN_POOL_SIZE,
+                maxIdleTimeMS=30000,
+                serverSelectionTimeoutMS=Config.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                waitQueueTimeoutMS=Config.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+                retryWrites=True,
+                w=Config.MONGODB_WRITE_CONCERN,
+                compressors=Config.MONGODB_COMPRESSORS
+            )
+            try:
+                # Test the connection
+                client.admin.command('ping')
+            except ConnectionFailure:
+                client.close()
+                raise
+            print("✅ Successfully connected to MongoDB")
+            _client = client
+        return _client
+
+@atexit.register
+def _close_client():
+    """Close the shared MongoClient when the process exits"""
+    global _client, _indexes_created
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+            _indexes_created = False
+
+def _truncated(field, width):
+    """Projection expression cutting a string field to width code points, marked with '...'"""
+    value = '$' + field
+    return {'$cond': [
+        {'$gt': [{'$strLenCP': {'$ifNull': [value, '']}}, width]},
+        {'$concat': [{'$substrCP': [value, 0, width]}, '...']},
+        value
+    ]}
+
 class DatabaseManager:
     """Manages database operations for professional data"""
     
+    # Fields shown in professional list views; pass as `fields` to skip the
+    # large nested arrays (experience, skills, ...) when they are not needed
+    LIST_VIEW_FIELDS = (
+        'unique_id', 'linkedinId', 'first_name', 'last_name', 'headline',
+        'job_title', 'company', 'city', 'source'
+    )
+    
+    # LIST_VIEW_FIELDS as a projection, with the long text columns cut down on the
+    # server to the widths the table shows, so the full strings never cross the wire
+    LIST_VIEW_PROJECTION = {
+        **{field: 1 for field in LIST_VIEW_FIELDS},
+        **{field: _truncated(field, width) for field, width in (('headline', 30), ('job_title', 25), ('company', 20))}
+    }
+    
+    INDEXES = [
+        # Unique linkedinId, so concurrent saves of one profile cannot both insert;
+        # sparse, so profiles without a LinkedIn ID are not indexed
+        IndexModel("linkedinId", unique=True, sparse=True),
+        IndexModel("unique_id", unique=True),
+        IndexModel("city", name="city_ci", collation=CASE_INSENSITIVE),
+        IndexModel("source"),
+        # Duplicate lookup for professionals without a LinkedIn ID. Being collated,
+        # it only serves queries that use the same collation
+        IndexModel(
+            [("company", 1), ("last_name", 1), ("first_name", 1), ("city", 1)],
+            name="dedup_ci", collation=CASE_INSENSITIVE
+        ),
+    ]
+    
+    # Indexes created by older versions: superseded by the collated indexes
+    # above, or (company_1) serving no current query, since nothing filters on company alone
+    LEGACY_INDEXES = ('company_1', 'first_name_1_last_name_1_company_1_city_1', 'city_1', 'dedup_compound')
+    
     def __init__(self):
+        # Connected lazily by the first database operation
         self.client = None
         self.db = None
         self.collection = None
-        self.connect()
+        # Background bulk writes (see start_professionals_bulk_save), created on first use
+        self._write_executor = None
+    
+    def _ensure_connected(self):
+        """Connect on first use"""
+        if self.collection is None:
+            self.connect()
     
     def connect(self):
-        """Connect to MongoDB database"""
+        """Connect to MongoDB database (through the shared client)"""
+        global _indexes_created
         try:
-            self.client = MongoClient(Config.MONGODB_URI)
-            # Test the connection
-            self.client.admin.command('ping')
-            print("✅ Successfully connected to MongoDB")
-            
+            self.client = _get_client()
             self.db = self.client[Config.DATABASE_NAME]
             self.collection = self.db[Config.COLLECTION_NAME]
             
-            # Create indexes for better performance
-            self.collection.create_index("unique_id", unique=True)
-            self.collection.create_index("linkedinId")  # Add index for LinkedIn ID
-            self.collection.create_index("city")
-            self.collection.create_index("company")
-            self.collection.create_index("source")  # Add index for source field
+            # Create indexes for better performance (once per process)
+            if not _indexes_created:
+                self._create_indexes()
+                _indexes_created = True
             
         except ConnectionFailure as e:
             print(f"❌ Failed to connect to MongoDB: {e}")
+            self.client = None
+            self.collection = None
             raise
     
+    def _create_indexes(self):
+        """
+        Create missing indexes and drop legacy ones
+        One listIndexes round trip when everything is in place; the missing
+        indexes are created together, and only legacy indexes that exist are dropped
+        """
+        existing = {index['name']: index for index in self.collection.list_indexes()}
+        
+        linkedin_id = existing.get('linkedinId_1')
+        if linkedin_id is not None and not linkedin_id.get('unique'):
+            self._upgrade_linkedin_id_index()
+        
+        missing = [index for index in self.INDEXES if index.document['name'] not in existing]
+        if missing:
+            try:
+                self.collection.create_indexes(missing)
+            except OperationFailure as e:
+                # One failing index fails the whole command; build the rest one at a time
+                print(f"⚠️  Could not create indexes together: {e}")
+                for index in missing:
+                    try:
+                        self.collection.create_indexes([index])
+                    except OperationFailure as index_error:
+                        print(f"⚠️  Could not create index {index.document['name']}: {index_error}")
+                        if index.document['name'] == 'linkedinId_1':
+                            # Existing duplicates block the unique index; keep lookups fast
+                            self.collection.create_index("linkedinId")
+        
+        for name in self.LEGACY_INDEXES:
+            if name in existing:
+                try:
+                    self.collection.drop_index(name)
+                except OperationFailure as e:
+                    print(f"⚠️  Could not drop legacy index {name}: {e}")
+    
+    def _upgrade_linkedin_id_index(self):
+        """
+        Replace an older non-unique linkedinId index with the unique one; if the
+        collection already holds duplicates a plain index is kept instead
+        """
+        try:
+            self.collection.drop_index("linkedinId_1")
+            self.collection.create_index("linkedinId", unique=True, sparse=True)
+        except OperationFailure as e:
+            print(f"⚠️  Could not make linkedinId unique: {e}")
+            self.collection.create_index("linkedinId")
+    
+    def _prepare_professional(self, professional_data, created_at):
+        """Fill in generated fields and normalize string fields before saving"""
+        # Generate unique ID if not provided
+        if 'unique_id' not in professional_data:
+            professional_data['unique_id'] = str(ObjectId())
+        
+        # Add timestamp
+        professional_data['created_at'] = created_at
+        
+        # Ensure source field is present
+        if 'source' not in professional_data:
+            professional_data['source'] = 'Unknown'
+        
+        # A missing LinkedIn ID is left out rather than stored as null, so it
+        # stays out of the sparse unique index
+        if professional_data.get('linkedinId') is None:
+            professional_data.pop('linkedinId', None)
+        
+        # Ensure all string fields are properly converted to strings
+        string_fields = ['first_name', 'last_name', 'company', 'city', 'headline', 'job_title']
+        for field in string_fields:
+            if field in professional_data:
+                if professional_data[field] is None:
+                    professional_data[field] = ''
+                else:
+                    professional_data[field] = str(professional_data[field])
+        
+        return {key: value for key, value in professional_data.items() if key != '_id'}
+    
+    def _duplicate_filter(self, professional_data):
+        """Query matching an existing copy of a professional (linkedinId if available, otherwise name and company)"""
+        if professional_data.get('linkedinId'):
+            return {'linkedinId': professional_data['linkedinId']}
+        return {
+            'first_name': professional_data.get('first_name', ''),
+            'last_name': professional_data.get('last_name', ''),
+            'company': professional_data.get('company', ''),
+            'city': professional_data.get('city', '')
+        }
+    
+    @staticmethod
+    def _duplicate_collation(duplicate_filter):
+        """Collation for a duplicate query: names and companies compare case-insensitively, LinkedIn IDs exactly"""
+        return None if 'linkedinId' in duplicate_filter else CASE_INSENSITIVE
+    
     def save_professional(self, professional_data):
-        """Save a professional to the database"""
+        """Save a professional to the database, returning its unique ID (or the existing copy's)"""
         try:
-            # Generate unique ID if not provided
-            if 'unique_id' not in professional_data:
-                professional_data['unique_id'] = str(uuid.uuid4())
-            
-            # Add timestamp
-            professional_data['created_at'] = datetime.utcnow()
-            
-            # Ensure source field is present
-            if 'source' not in professional_data:
-                professional_data['source'] = 'Unknown'
+            self._ensure_connected()
+            document = self._prepare_professional(professional_data, datetime.now(timezone.utc))
             
-            # Ensure all string fields are properly converted to strings
-            string_fields = ['first_name', 'last_name', 'company', 'city', 'headline', 'job_title']
-            for field in string_fields:
-                if field in professional_data:
-                    if professional_data[field] is None:
-                        professional_data[field] = ''
-                    else:
-                        professional_data[field] = str(professional_data[field])
+            # Insert unless a copy already exists, in a single round trip
+            duplicate_filter = self._duplicate_filter(document)
+            def upsert():
+                return self.collection.find_one_and_update(
+                    duplicate_filter,
+                    {'$setOnInsert': document},
+                    projection={'unique_id': 1},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                    collation=self._duplicate_collation(duplicate_filter)
+                )
             
-            # Check if professional already exists (based on linkedinId if available, otherwise name and company)
-            if 'linkedinId' in professional_data and professional_data['linkedinId']:
-                existing = self.collection.find_one({'linkedinId': professional_data['linkedinId']})
-            else:
-                existing = self.collection.find_one({
-                    'first_name': professional_data.get('first_name', ''),
-                    'last_name': professional_data.get('last_name', ''),
-                    'company': professional_data.get('company', ''),
-                    'city': professional_data.get('city', '')
-                })
-            
-            if existing:
-                print(f"⚠️  Professional {professional_data.get('first_name', '')} {professional_data.get('last_name', '')} already exists")
-                return existing['unique_id']
+            try:
+                saved = upsert()
+            except DuplicateKeyError:
+                # A concurrent save inserted the same profile first; this time it matches
+                saved = upsert()
             
-            # Insert new professional
-            result = self.collection.insert_one(professional_data)
-            return professional_data['unique_id']
+            if saved['unique_id'] != document['unique_id']:
+                logger.info("⚠️  Professional %s %s already exists", document.get('first_name', ''), document.get('last_name', ''))
+            return saved['unique_id']
             
         except Exception as e:
             print(f"❌ Error saving professional: {e}")
             return None
     
-    def get_professionals_by_city(self, city):
-        """Get all professionals from a specific city"""
+    def save_professionals_bulk(self, professionals):
+        """
+        Save many professionals in one bulk write
+        Professionals that already exist are left untouched.
+        Returns the number of professionals now stored (new or already present)
+        """
+        if not professionals:
+            return 0
+        return self._report_bulk_write(*self._bulk_write(self._bulk_operations(professionals)))
+    
+    def start_professionals_bulk_save(self, professionals):
+        """
+        Start save_professionals_bulk's write in the background and return its Future
+        The documents are prepared (IDs, timestamps) before this returns, so the
+        caller can display them while the write is in flight; pass the Future to
+        finish_professionals_bulk_save for the saved count
+        """
+        operations = self._bulk_operations(professionals) if professionals else []
+        if self._write_executor is None:
+            self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mongo-write')
+        return self._write_executor.submit(self._bulk_write, operations)
+    
+    def finish_professionals_bulk_save(self, future):
+        """Wait for a write started by start_professionals_bulk_save, report it and return the saved count"""
+        return self._report_bulk_write(*future.result())
+    
+    def _bulk_operations(self, professionals):
+        """One duplicate-checking upsert per professional, all sharing one timestamp"""
+        created_at = datetime.now(timezone.utc)
+        operations = []
+        for professional_data in professionals:
+            document = self._prepare_professional(professional_data, created_at)
+            duplicate_filter = self._duplicate_filter(document)
+            operations.append(UpdateOne(
+                duplicate_filter, {'$setOnInsert': document}, upsert=True,
+                collation=self._duplicate_collation(duplicate_filter)
+            ))
+        return operations
+    
+    def _bulk_write(self, operations):
+        """Run the upserts in one bulk write; returns (inserted, already existing, failed) counts"""
+        if not operations:
+            return 0, 0, 0
         try:
+            self._ensure_connected()
+            # Unordered lets the server carry on past failures
+            result = self.collection.bulk_write(operations, ordered=False)
+            return result.upserted_count, result.matched_count, 0
+        except BulkWriteError as e:
+            # Unordered writes carry on past failures; count what did succeed.
+            # Duplicate-key errors are profiles a concurrent save stored first
+            write_errors = e.details.get('writeErrors', [])
+            duplicates = sum(1 for error in write_errors if error.get('code') == 11000)
+            inserted = e.details.get('nUpserted', 0)
+            existing = e.details.get('nMatched', 0) + duplicates
+            return inserted, existing, len(write_errors) - duplicates
+        except Exception as e:
+            print(f"❌ Error saving professionals: {e}")
+            return 0, 0, 0
+    
+    def _report_bulk_write(self, inserted, existing, failed):
+        """Print what a bulk write skipped and return the number of professionals now stored"""
+        if failed:
+            print(f"⚠️  {failed} professionals could not be saved")
+        if existing:
+            print(f"⚠️  {existing} professionals already exist")
+        return inserted + existing
+    
+    @staticmethod
+    def _projection(fields, exclude_id=False):
+        """Projection returning only the given fields (all fields if None); a dict is used as the projection itself"""
+        if fields is None:
+            return {'_id': 0} if exclude_id else None
+        projection = dict(fields) if isinstance(fields, dict) else {field: 1 for field in fields}
+        projection['_id'] = 0
+        return projection
+    
+    def get_professionals_by_city(self, city, fields=None):
+        """Get all professionals from a specific city (only the given fields, if any)"""
+        try:
+            self._ensure_connected()
             # Validate city parameter
             if not city or not isinstance(city, str):
                 print("⚠️  Invalid city parameter provided")
                 return []
             
-            professionals = list(self.collection.find({'city': city.lower()}))
+            professionals = list(self.collection.find(
+                {'city': city}, self._projection(fields), collation=CASE_INSENSITIVE
+            ))
             return professionals
         except Exception as e:
             print(f"❌ Error retrieving professionals: {e}")
             return []
     
-    def get_professionals_by_source(self, source):
-        """Get all professionals from a specific source"""
+    def iter_professionals_by_city(self, city, fields=None, batch_size=500):
+        """Stream professionals from a specific city without loading them all into memory"""
         try:
-            professionals = list(self.collection.find({'source': source}))
+            self._ensure_connected()
+            if not city or not isinstance(city, str):
+                print("⚠️  Invalid city parameter provided")
+                return iter(())
+            
+            return self.collection.find(
+                {'city': city}, self._projection(fields), batch_size=batch_size, collation=CASE_INSENSITIVE
+            )
+        except Exception as e:
+            print(f"❌ Error retrieving professionals: {e}")
+            return iter(())
+    
+    def get_professionals_by_source(self, source, fields=None):
+        """Get all professionals from a specific source (only the given fields, if any)"""
+        try:
+            self._ensure_connected()
+            professionals = list(self.collection.find({'source': source}, self._projection(fields)))
             return professionals
         except Exception as e:
             print(f"❌ Error retrieving professionals: {e}")
             return []
     
-    def get_all_professionals(self):
-        """Get all professionals from the database"""
+    def get_all_professionals(self, fields=None):
+        """Get all professionals from the database (only the given fields, if any)"""
         try:
-            professionals = list(self.collection.find({}, {'_id': 0}))
+            self._ensure_connected()
+            professionals = list(self.collection.find({}, self._projection(fields, exclude_id=True)))
             return professionals
         except Exception as e:
             print(f"❌ Error retrieving all professionals: {e}")
             return []
     
+    def iter_all_professionals(self, fields=None, sort_by_city=False, batch_size=500):
+        """Stream all professionals without loading them all into memory (optionally ordered by city)"""
+        try:
+            self._ensure_connected()
+            cursor = self.collection.find({}, self._projection(fields, exclude_id=True), batch_size=batch_size)
+            if sort_by_city:
+                # Collated like the city index, so mixed-case spellings of a city sort together
+                cursor = cursor.collation(CASE_INSENSITIVE).sort('city', 1)
+            return cursor
+        except Exception as e:
+            print(f"❌ Error retrieving all professionals: {e}")
+            return iter(())
+    
+    def get_city_source_counts(self):
+        """Count professionals per (city, source) pair on the server"""
+        try:
+            self._ensure_connected()
+            pipeline = [{'$group': {'_id': {'city': '$city', 'source': '$source'}, 'c': {'$sum': 1}}}]
+            return list(self.collection.aggregate(pipeline))
+        except Exception as e:
+            print(f"❌ Error counting professionals by city and source: {e}")
+            return []
+    
     def delete_professional(self, unique_id):
         """Delete a professional by unique ID"""
         try:
+            self._ensure_connected()
             result = self.collection.delete_one({'unique_id': unique_id})
             if result.deleted_count > 0:
                 print(f"✅ Deleted professional with ID: {unique_id}")
@@ -130,19 +428,21 @@ class DatabaseManager:
     def get_statistics(self):
         """Get database statistics"""
         try:
-            total_professionals = self.collection.count_documents({})
-            
-            # Get unique cities
-            cities = self.collection.distinct('city')
-            
-            # Get unique sources
-            sources = self.collection.distinct('source')
+            self._ensure_connected()
+            # One round trip: per-source counts and cities come from a single $facet.
+            # The per-source counts cover every document, so they also give the total
+            # without a separate $count pass over the collection
+            pipeline = [{'$facet': {
+                'by_source': [{'$group': {'_id': '$source', 'c': {'$sum': 1}}}],
+                'cities': [{'$group': {'_id': '$city'}}, {'$sort': {'_id': 1}}]
+            }}]
+            stats = next(self.collection.aggregate(pipeline), {})
             
-            # Get counts by source
-            source_counts = {}
-            for source in sources:
-                count = self.collection.count_documents({'source': source})
-                source_counts[source] = count
+            by_source = stats.get('by_source', [])
+            total_professionals = sum(doc['c'] for doc in by_source)
+            source_counts = {doc['_id']: doc['c'] for doc in by_source if doc['_id'] is not None}
+            sources = list(source_counts)
+            cities = [doc['_id'] for doc in stats.get('cities', []) if doc['_id'] is not None]
             
             return {
                 'total_professionals': total_professionals,
@@ -157,7 +457,12 @@ class DatabaseManager:
             return {}
     
     def close(self):
-        """Close database connection"""
+        """Release this manager's handle; the shared client is closed when the process exits"""
+        if self._write_executor is not None:
+            self._write_executor.shutdown(wait=True)
+            self._write_executor = None
         if self.client:
-            self.client.close()
+            self.client = None
+            self.db = None
+            self.collection = None
             print("🔌 Database connection closed") 
\ No newline at end of file
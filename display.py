@@ -1,4 +1,3 @@
-import pandas as pd
 from tabulate import tabulate
 from datetime import datetime
 
@@ -7,31 +6,34 @@ class DisplayManager:
     
     @staticmethod
     def display_professionals_table(professionals, city):
-        """Display professionals in a formatted table"""
-        if not professionals:
-            print(f"\n❌ No professionals found in {city}")
-            return
-        
-        # Prepare data for tabulation
+        """Display professionals (a list or a streaming cursor) in a formatted table"""
+        # Prepare data for tabulation; each document is dropped once its row is built
         table_data = []
+        truncate = DisplayManager._truncate
         for prof in professionals:
+            get = prof.get
+            
             # Get LinkedIn ID (truncated for display)
-            linkedin_id = prof.get('linkedinId', 'N/A')
+            linkedin_id = get('linkedinId', 'N/A')
             if linkedin_id and linkedin_id != 'N/A':
                 linkedin_id = linkedin_id[:8] + '...'
             
             table_data.append([
-                prof.get('unique_id', 'N/A')[:8] + '...',  # Truncate UUID for display
+                '...' + get('unique_id', 'N/A')[-8:],  # Truncate ID for display (ObjectIds share a leading timestamp)
                 linkedin_id,
-                prof.get('first_name', 'N/A'),
-                prof.get('last_name', 'N/A'),
-                prof.get('headline', 'N/A')[:30] + '...' if len(prof.get('headline', '')) > 30 else prof.get('headline', 'N/A'),
-                prof.get('job_title', 'N/A')[:25] + '...' if len(prof.get('job_title', '')) > 25 else prof.get('job_title', 'N/A'),
-                prof.get('company', 'N/A')[:20] + '...' if len(prof.get('company', '')) > 20 else prof.get('company', 'N/A'),
-                prof.get('city', 'N/A'),
-                prof.get('source', 'N/A')
+                get('first_name', 'N/A'),
+                get('last_name', 'N/A'),
+                truncate(get('headline', 'N/A'), 30),
+                truncate(get('job_title', 'N/A'), 25),
+                truncate(get('company', 'N/A'), 20),
+                get('city', 'N/A'),
+                get('source', 'N/A')
             ])
         
+        if not table_data:
+            print(f"\n❌ No professionals found in {city}")
+            return
+        
         # Create table
         headers = ['ID', 'LinkedIn ID', 'First Name', 'Last Name', 'Headline', 'Job Title', 'Company', 'City', 'Source']
         table = tabulate(table_data, headers=headers, tablefmt='grid', showindex=False)
@@ -39,7 +41,14 @@ class DisplayManager:
         print(f"\n📊 Professionals in {city}:")
         print("=" * 120)
         print(table)
-        print(f"\nTotal professionals found: {len(professionals)}")
+        print(f"\nTotal professionals found: {len(table_data)}")
+    
+    @staticmethod
+    def _truncate(value, width):
+        """Cut a string to width characters, marking the cut with '...' (values already cut by the database come out unchanged)"""
+        if isinstance(value, str) and len(value) > width:
+            return value[:width] + '...'
+        return value
     
     @staticmethod
     def display_professional_details(professional):
@@ -77,30 +86,29 @@ class DisplayManager:
     def display_database_stats(db_manager):
         """Display database statistics"""
         try:
-            all_professionals = db_manager.get_all_professionals()
+            counts = db_manager.get_city_source_counts()
             
-            if not all_professionals:
+            if not counts:
                 print("\n📊 Database is empty")
                 return
             
-            # Group by city and source
+            # Roll the (city, source) counts up into per-city and per-source totals
+            total = 0
             cities = {}
             sources = {}
-            for prof in all_professionals:
-                city = prof.get('city', 'Unknown').title()
-                source = prof.get('source', 'Unknown')
-                
-                if city not in cities:
-                    cities[city] = 0
-                cities[city] += 1
+            for row in counts:
+                group = row['_id']
+                city = (group.get('city') or 'Unknown').title()
+                source = group.get('source') or 'Unknown'
+                count = row['c']
                 
-                if source not in sources:
-                    sources[source] = 0
-                sources[source] += 1
+                total += count
+                cities[city] = cities.get(city, 0) + count
+                sources[source] = sources.get(source, 0) + count
             
             print("\n📊 DATABASE STATISTICS")
             print("=" * 40)
-            print(f"Total professionals: {len(all_professionals)}")
+            print(f"Total professionals: {total}")
             print(f"Number of cities: {len(cities)}")
             
             print("\nProfessionals by source:")
@@ -1,54 +1,87 @@
 import google.generativeai as genai
-import json
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import json_codec
 from config import Config
 
-class GeminiClient:
-    """Client for interacting with Google Gemini AI"""
-    
-    def __init__(self):
-        if not Config.GEMINI_API_KEY:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
-        
-        genai.configure(api_key=Config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
-    
-    def search_professionals(self, city, max_results=10):
-        """Search for professionals in a given city using Gemini AI"""
-        
-        prompt = f"""
-        You are a professional research assistant. I need you to find {max_results} real professionals who work and reside in {city}, USA.
+# The outermost {...} block in a model response
+JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Source recorded on professionals found through Gemini
+SOURCE = 'Gemini AI'
+
+# Instructions shared by every search prompt; the city and count are appended after them
+SEARCH_INSTRUCTIONS = """
+        You are a professional research assistant. I need you to find real professionals who work and reside in the city given at the end of this message.
         
         For each professional, provide the following information in a structured format:
         - First Name
         - Last Name  
         - Current Company/Organization
         - Job Title
-        - City (should be {city})
+        - City (should be the given city, without the state or country)
         
         Please provide the results in the following JSON format:
-        {{
+        {
             "professionals": [
-                {{
+                {
                     "first_name": "John",
                     "last_name": "Doe",
                     "company": "Tech Corp",
                     "job_title": "Software Engineer",
-                    "city": "{city}"
-                }}
+                    "city": "<the given city>"
+                }
             ]
-        }}
+        }
         
         Important guidelines:
-        1. Only include real professionals who actually work in {city}
+        1. Only include real professionals who actually work in the given city
         2. Focus on diverse industries and roles
         3. Ensure all information is accurate and current
         4. If you cannot find enough real professionals, indicate this clearly
         5. Do not make up or fabricate information
         6. Only include US-based professionals
+        7. Return at most the number of professionals requested
         
         Return only the JSON response, no additional text.
         """
+
+# Fields every professional returned by Gemini must have
+REQUIRED_FIELDS = ('first_name', 'last_name', 'company', 'job_title', 'city')
+
+# Configured models keyed by (api key, model name), shared by every client
+_models = {}
+_models_lock = threading.Lock()
+
+
+def _get_model(api_key, model_name):
+    """Return the shared GenerativeModel for this key and model, configuring genai on first use"""
+    key = (api_key, model_name)
+    with _models_lock:
+        if key not in _models:
+            genai.configure(api_key=api_key)
+            _models[key] = genai.GenerativeModel(model_name)
+        return _models[key]
+
+class GeminiClient:
+    """Client for interacting with Google Gemini AI"""
+    
+    def __init__(self):
+        if not Config.GEMINI_API_KEY:
+            raise ValueError("GEMINI_API_KEY not found in environment variables")
+        
+        self.model = _get_model(Config.GEMINI_API_KEY, Config.GEMINI_MODEL)
+    
+    def search_professionals(self, city, max_results=10):
+        """Search for professionals in a given city using Gemini AI"""
+        
+        # Fixed instructions first and the city last, so every search sends the
+        # same prompt shape and only the short tail varies
+        prompt = f"""{SEARCH_INSTRUCTIONS}
+        City: {city}, USA
+        Number of professionals: {max_results}
+        """
         
         try:
             print(f"🔍 Searching for professionals in {city} using {Config.GEMINI_MODEL}...")
@@ -59,18 +92,17 @@ class GeminiClient:
             content = response.text.strip()
             
             # Try to find JSON in the response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = JSON_RE.search(content)
             if json_match:
                 json_str = json_match.group()
-                data = json.loads(json_str)
+                data = json_codec.loads(json_str)
                 
                 professionals = data.get('professionals', [])
                 
                 # Validate and clean the data
-                cleaned_professionals = []
-                for prof in professionals:
-                    if self._validate_professional(prof, city):
-                        cleaned_professionals.append(prof)
+                cleaned_professionals = self._valid_professionals(professionals, city)
+                for prof in cleaned_professionals:
+                    prof['source'] = SOURCE
                 
                 print(f"✅ Found {len(cleaned_professionals)} valid professionals in {city}")
                 return cleaned_professionals[:max_results]
@@ -83,24 +115,31 @@ class GeminiClient:
             print(f"❌ Error searching for professionals: {e}")
             return []
     
-    def _validate_professional(self, professional, expected_city):
-        """Validate professional data"""
-        required_fields = ['first_name', 'last_name', 'company', 'job_title', 'city']
-        
-        # Check if all required fields are present
-        for field in required_fields:
-            if field not in professional or not professional[field]:
-                return False
-        
-        # Check if city matches expected city
-        if professional['city'].lower() != expected_city.lower():
-            return False
-        
-        # Basic validation for names
-        if len(professional['first_name']) < 2 or len(professional['last_name']) < 2:
-            return False
+    def search_professionals_batch(self, cities, max_results=10, concurrency=4):
+        """
+        Search several cities at once
+        Each request mostly waits on the model, so the cities are searched on
+        a thread pool and take about as long as the slowest one
+        """
+        if not cities:
+            return {}
         
-        return True
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(cities))) as executor:
+            found = executor.map(lambda city: self.search_professionals(city, max_results), cities)
+            return dict(zip(cities, found))
+    
+    def _valid_professionals(self, professionals, expected_city):
+        """
+        Keep professionals with every required field, the expected city and
+        plausible (2+ character) names
+        """
+        expected_city = expected_city.lower()
+        return [
+            prof for prof in professionals
+            if all(prof.get(field) for field in REQUIRED_FIELDS)
+            and prof['city'].lower() == expected_city
+            and len(prof['first_name']) >= 2 and len(prof['last_name']) >= 2
+        ]
     
     def get_professional_summary(self, city, professionals):
         """Generate a summary of professionals found in a city"""
@@ -0,0 +1,33 @@
+"""
+JSON encoding helpers
+Uses orjson when it is installed and falls back to the standard library json module
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Encode an object as compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, sort_keys=sort_keys).encode('utf-8')
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Encode an object as indented JSON text, for logs and files meant to be read"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
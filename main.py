@@ -7,55 +7,93 @@ and stores the results in a local MongoDB database.
 
 import sys
 import os
+import time
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from itertools import chain, groupby, islice
 from typing import List, Dict
 
 from database import DatabaseManager
-from gemini_client import GeminiClient
-from apify_controller import ApifyController
 from display import DisplayManager
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+# Where a dataset item may carry its location, most specific first: parsed
+# location, LinkedIn's location text, current position, latest experience.
+# A missing key or empty list yields None rather than raising
+CITY_EXTRACTORS = (
+    lambda result: ((result.get('location') or {}).get('parsed') or {}).get('city'),
+    lambda result: (result.get('location') or {}).get('linkedinText'),
+    lambda result: ((result.get('currentPosition') or [{}])[0] or {}).get('location'),
+    lambda result: ((result.get('experience') or [{}])[0] or {}).get('location'),
+)
+
 class ProfessionalFinder:
     """Main application class for finding and managing professional data"""
     
-    def __init__(self):
+    # Most recent city views kept in memory (see VIEW_CACHE_TTL)
+    VIEW_CACHE_SIZE = 32
+    
+    def __init__(self, force_refresh=False):
+        # Bypass the Apify result cache and always start new runs
+        self.force_refresh = force_refresh
         self.db_manager = None
         self.gemini_client = None
         self.apify_controller = None
         self.display_manager = DisplayManager()
         
+        # Recently viewed professionals: key -> (time fetched, professionals)
+        self._view_cache = {}
+        
         try:
             # Initialize database connection
             self.db_manager = DatabaseManager()
             
-            # Initialize search clients based on configuration
-            if Config.USE_APIFY and Config.APIFY_API_TOKEN:
-                try:
-                    self.apify_controller = ApifyController()
-                    # Test API connection
-                    if self.apify_controller.test_api_connection():
-                        print("✅ Apify controller initialized successfully")
-                        # Test actor availability
+            # Connect to MongoDB (ping, index setup) in the background while the
+            # search clients run their network checks
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                db_warmup = executor.submit(self.db_manager.connect)
+                
+                # Initialize search clients based on configuration
+                # Each client is imported only when configured, so an unused SDK is never loaded
+                if Config.USE_APIFY and Config.APIFY_API_TOKEN:
+                    try:
+                        from apify_controller import ApifyController
+                        self.apify_controller = ApifyController()
+                        # Test API connection and actor availability in parallel
                         actor_id = "harvestapi~linkedin-profile-search"
-                        if self.apify_controller.test_actor_availability(actor_id):
-                            print("✅ Actor is available and accessible")
+                        connected, actor_available = self.apify_controller.preflight(actor_id)
+                        flush_logging()
+                        if connected:
+                            print("✅ Apify controller initialized successfully")
+                            if actor_available:
+                                print("✅ Actor is available and accessible")
+                            else:
+                                print("⚠️  Actor is not available or accessible")
+                                self.apify_controller = None
                         else:
-                            print("⚠️  Actor is not available or accessible")
+                            print("⚠️  Apify controller initialized but API connection failed")
                             self.apify_controller = None
-                    else:
-                        print("⚠️  Apify controller initialized but API connection failed")
+                    except Exception as e:
+                        print(f"⚠️  Failed to initialize Apify controller: {e}")
                         self.apify_controller = None
-                except Exception as e:
-                    print(f"⚠️  Failed to initialize Apify controller: {e}")
-                    self.apify_controller = None
-            
-            if Config.GEMINI_API_KEY:
-                try:
-                    self.gemini_client = GeminiClient()
-                    print("✅ Gemini client initialized successfully")
-                except Exception as e:
-                    print(f"⚠️  Failed to initialize Gemini client: {e}")
-                    self.gemini_client = None
+                
+                # Gemini is only searched as a fallback unless USE_GEMINI_SEARCH is set,
+                # so its SDK is not loaded while Apify is available
+                if Config.GEMINI_API_KEY and (Config.USE_GEMINI_SEARCH or not self.apify_controller):
+                    try:
+                        from gemini_client import GeminiClient
+                        self.gemini_client = GeminiClient()
+                        print("✅ Gemini client initialized successfully")
+                    except Exception as e:
+                        print(f"⚠️  Failed to initialize Gemini client: {e}")
+                        self.gemini_client = None
+            
+            # A failed warm-up is retried by the first database operation
+            db_warmup.exception()
             
             if not self.apify_controller and not self.gemini_client:
                 raise Exception("No search methods available. Please check your API keys.")
@@ -70,116 +108,242 @@ class ProfessionalFinder:
         """Search for professionals in a given city"""
         try:
             # Validate city input
-            if not city or not city.strip():
+            city = (city or '').strip()
+            if not city:
                 self.display_manager.display_error("City name cannot be empty")
                 return
             
-            city = city.strip().title()
+            city = city.title()
+            
+            searches = []
+            if self._use_apify():
+                searches.append(("HarvestAPI LinkedIn Profile Search", lambda: {
+                    city: self.apify_controller.search_professionals_with_linkedin_scraper(
+                        city,
+                        max_results=Config.MAX_RESULTS,
+                        force_refresh=self.force_refresh
+                    )
+                }))
+            if self._use_gemini():
+                searches.append(("Gemini AI", lambda: {
+                    city: self.gemini_client.search_professionals(city, max_results=Config.MAX_RESULTS)
+                }))
+            
+            results, search_methods_used = self._run_searches(searches)
+            self._save_and_display_results({city: results.get(city, [])}, search_methods_used)
+            
+        except Exception as e:
+            self.display_manager.display_error(f"Error searching for professionals: {e}")
+    
+    def search_professionals_in_cities(self, cities):
+        """Search for professionals in several cities, running the searches concurrently"""
+        try:
+            cities = [city.strip().title() for city in cities if city and city.strip()]
+            if not cities:
+                self.display_manager.display_error("City name cannot be empty")
+                return
             
-            professionals = []
-            search_methods_used = []
+            searches = []
+            if self._use_apify():
+                searches.append(("HarvestAPI LinkedIn Profile Search", lambda: self.apify_controller.search_professionals_batch(
+                    cities,
+                    max_results=Config.MAX_RESULTS,
+                    force_refresh=self.force_refresh
+                )))
+            if self._use_gemini():
+                searches.append(("Gemini AI", lambda: self.gemini_client.search_professionals_batch(
+                    cities,
+                    max_results=Config.MAX_RESULTS
+                )))
+            
+            results, search_methods_used = self._run_searches(searches)
+            self._save_and_display_results(
+                {city: results.get(city, []) for city in cities},
+                search_methods_used
+            )
             
-            # Try Apify if available
-            if self.apify_controller and Config.USE_APIFY:
+        except Exception as e:
+            self.display_manager.display_error(f"Error searching for professionals: {e}")
+    
+    def _use_apify(self):
+        """Whether searches should use Apify"""
+        return bool(self.apify_controller and Config.USE_APIFY)
+    
+    def _use_gemini(self):
+        """Whether searches should use Gemini: when Apify is off or unavailable, or alongside it if enabled"""
+        return bool(self.gemini_client and (Config.USE_GEMINI_SEARCH or not self._use_apify()))
+    
+    def _run_searches(self, searches):
+        """
+        Run each (method name, search) pair, where a search returns professionals keyed by city
+        Several methods run at the same time, since each mostly waits on its API; a
+        failing method is reported and skipped. Returns the merged results and the
+        names of the methods that succeeded
+        """
+        results = {}
+        search_methods_used = []
+        if not searches:
+            return results, search_methods_used
+        
+        with ThreadPoolExecutor(max_workers=len(searches)) as executor:
+            futures = []
+            for method, search in searches:
+                print(f"🔍 Searching with {method}...")
+                futures.append((method, executor.submit(search)))
+            
+            for method, future in futures:
                 try:
-                    print(f"🔍 Searching with HarvestAPI LinkedIn Profile Search...")
-                    apify_professionals = self.apify_controller.search_professionals_with_linkedin_scraper(
-                        city, 
-                        max_results=Config.MAX_RESULTS
-                    )
-                    professionals.extend(apify_professionals)
-                    search_methods_used.append("HarvestAPI LinkedIn Profile Search")
-                        
+                    found = future.result()
                 except Exception as e:
-                    print(f"⚠️  Apify search failed: {e}")
-            
+                    print(f"⚠️  {method} search failed: {e}")
+                    continue
+                for city, professionals in found.items():
+                    results.setdefault(city, []).extend(professionals)
+                search_methods_used.append(method)
+        
+        flush_logging()
+        return results, search_methods_used
+    
+    def _save_and_display_results(self, results, search_methods_used):
+        """Deduplicate the professionals found per city, save them all in one bulk write and display them"""
+        found = {}
+        for city, professionals in results.items():
             if not professionals:
                 self.display_manager.display_warning(f"No professionals found in {city}")
-                return
+                continue
             
             # Remove duplicates based on name and company
-            unique_professionals = self._remove_duplicates(professionals)
-            
-            # Save professionals to database
-            saved_count = 0
+            unique_professionals = self._remove_duplicates(professionals)[:Config.MAX_RESULTS]
+            city_lower = city.lower()  # Normalize city name
             for professional in unique_professionals:
-                professional['city'] = city.lower()  # Normalize city name
-                unique_id = self.db_manager.save_professional(professional)
-                if unique_id:
-                    saved_count += 1
-            
-            # Display results
+                professional['city'] = city_lower
+            found[city] = unique_professionals
+        
+        if not found:
+            return
+        
+        # Save professionals from every city to the database at once, displaying
+        # them while the write is in flight
+        all_professionals = [professional for professionals in found.values() for professional in professionals]
+        save = self.db_manager.start_professionals_bulk_save(all_professionals)
+        
+        # Display results
+        for city, unique_professionals in found.items():
             self.display_manager.display_professionals_table(unique_professionals, city)
-            self.display_manager.display_search_summary(city, len(unique_professionals), saved_count)
-            
-            # Show search methods used
-            if search_methods_used:
-                print(f"\n🔍 Search methods used: {', '.join(search_methods_used)}")
-            
-        except Exception as e:
-            self.display_manager.display_error(f"Error searching for professionals: {e}")
+        
+        saved_count = self.db_manager.finish_professionals_bulk_save(save)
+        self._view_cache.clear()
+        self.display_manager.display_search_summary(', '.join(found), len(all_professionals), saved_count)
+        
+        # Show search methods used
+        if search_methods_used:
+            print(f"\n🔍 Search methods used: {', '.join(search_methods_used)}")
+    
+    @staticmethod
+    def _dedup_key(prof):
+        """Identity of a professional for de-duplication"""
+        # Same identity the database uses for duplicates: the LinkedIn ID when
+        # present, otherwise the lowercased name and company as a tuple
+        get = prof.get
+        return get('linkedinId') or (
+            str(get('first_name') or '').lower(),
+            str(get('last_name') or '').lower(),
+            str(get('company') or '').lower()
+        )
     
     def _remove_duplicates(self, professionals):
-        """Remove duplicate professionals based on name and company"""
-        seen = set()
-        unique_professionals = []
+        """Remove duplicate professionals based on LinkedIn ID, or name and company without one"""
+        if len(professionals) <= 1:
+            return professionals
         
-        for prof in professionals:
-            # Create a key based on name and company with safe string conversion
-            first_name = str(prof.get('first_name', '')).lower()
-            last_name = str(prof.get('last_name', '')).lower()
-            company = str(prof.get('company', '')).lower()
-            
-            key = f"{first_name}_{last_name}_{company}"
-            
-            if key not in seen:
-                seen.add(key)
-                unique_professionals.append(prof)
+        keys = [self._dedup_key(prof) for prof in professionals]
+        if len(set(keys)) == len(keys):
+            return professionals  # The common case: nothing to remove
         
-        return unique_professionals
+        # Keep the first professional seen for each key
+        unique_professionals = {}
+        for key, prof in zip(keys, professionals):
+            unique_professionals.setdefault(key, prof)
+        return list(unique_professionals.values())
     
     def view_all_professionals(self):
         """View all professionals in the database"""
         try:
-            professionals = self.db_manager.get_all_professionals()
+            professionals = self.db_manager.iter_all_professionals(
+                fields=DatabaseManager.LIST_VIEW_PROJECTION, sort_by_city=True
+            )
             
-            if not professionals:
+            first = next(professionals, None)
+            if first is None:
                 self.display_manager.display_warning("No professionals found in database")
                 return
             
-            # Group by city for better display
-            cities = {}
-            for prof in professionals:
-                city = prof.get('city', 'Unknown').title()
-                if city not in cities:
-                    cities[city] = []
-                cities[city].append(prof)
-            
-            for city, city_professionals in cities.items():
-                self.display_manager.display_professionals_table(city_professionals, city)
+            # The cursor is ordered by city, so each page's cities come from
+            # consecutive documents and only one page is held at a time
+            pages = self._pages(chain([first], professionals), Config.VIEW_PAGE_SIZE)
+            for page_number, page in enumerate(pages, 1):
+                if page_number > 1 and input("\nPress Enter for more, or 'q' to stop: ").strip().lower() == 'q':
+                    break
+                by_city = groupby(page, key=lambda prof: prof.get('city', 'Unknown').title())
+                for city, city_professionals in by_city:
+                    self.display_manager.display_professionals_table(city_professionals, city)
             
         except Exception as e:
             self.display_manager.display_error(f"Error retrieving professionals: {e}")
     
+    @staticmethod
+    def _pages(professionals, page_size):
+        """Split professionals into lists of page_size (a single page if page_size is 0)"""
+        if page_size <= 0:
+            yield list(professionals)
+            return
+        while page := list(islice(professionals, page_size)):
+            yield page
+    
     def view_professionals_by_city(self, city):
         """View professionals from a specific city"""
         try:
-            if not city or not city.strip():
+            city = (city or '').strip()
+            if not city:
                 self.display_manager.display_error("City name cannot be empty")
                 return
             
-            city = city.strip().lower()
-            professionals = self.db_manager.get_professionals_by_city(city)
+            city_lower, city_title = city.lower(), city.title()
+            professionals = self._cached_fetch(
+                ('city', city_lower),
+                lambda: self.db_manager.get_professionals_by_city(city_lower, fields=DatabaseManager.LIST_VIEW_PROJECTION)
+            )
             
             if not professionals:
-                self.display_manager.display_warning(f"No professionals found in {city.title()}")
+                self.display_manager.display_warning(f"No professionals found in {city_title}")
                 return
             
-            self.display_manager.display_professionals_table(professionals, city.title())
+            self.display_manager.display_professionals_table(professionals, city_title)
             
         except Exception as e:
             self.display_manager.display_error(f"Error retrieving professionals: {e}")
     
+    def _cached_fetch(self, key, fetch):
+        """
+        Return professionals fetched for this key within the last VIEW_CACHE_TTL
+        seconds, calling fetch() otherwise; empty results are not cached
+        """
+        if Config.VIEW_CACHE_TTL <= 0:
+            return fetch()
+        
+        cached = self._view_cache.get(key)
+        if cached and time.monotonic() - cached[0] < Config.VIEW_CACHE_TTL:
+            return cached[1]
+        
+        professionals = fetch()
+        if professionals:
+            self._view_cache.pop(key, None)
+            if len(self._view_cache) >= self.VIEW_CACHE_SIZE:
+                # Evict the entry fetched longest ago
+                self._view_cache.pop(next(iter(self._view_cache)))
+            self._view_cache[key] = (time.monotonic(), professionals)
+        return professionals
+    
     def get_last_run_dataset(self):
         """Get and save the last run's dataset"""
         try:
@@ -189,9 +353,12 @@ class ProfessionalFinder:
             
             print(f"🔍 Getting last run dataset...")
             
-            # Get last run info first
+            # Get last run info and its dataset in parallel
             actor_id = "harvestapi~linkedin-profile-search"
-            last_run_info = self.apify_controller.get_last_run_info(actor_id)
+            last_run_info, results = self.apify_controller.get_last_run_dataset_and_info(
+                actor_id, max_results=Config.MAX_RESULTS
+            )
+            flush_logging()
             
             if not last_run_info:
                 self.display_manager.display_warning("No successful last run found")
@@ -201,9 +368,6 @@ class ProfessionalFinder:
             print(f"✅ Last run started: {last_run_info.get('startedAt', 'Unknown')}")
             print(f"✅ Last run finished: {last_run_info.get('finishedAt', 'Unknown')}")
             
-            # Get the dataset from the last run
-            results = self.apify_controller.get_last_run_dataset(actor_id, max_results=Config.MAX_RESULTS)
-            
             if not results:
                 self.display_manager.display_warning("No results found in last run dataset")
                 return
@@ -216,17 +380,15 @@ class ProfessionalFinder:
                 return
             
             # Remove duplicates based on linkedinId
-            unique_professionals = self._remove_duplicates(professionals)
+            unique_professionals = self._remove_duplicates(professionals)[:Config.MAX_RESULTS]
             
-            # Save professionals to database
-            saved_count = 0
-            for professional in unique_professionals:
-                unique_id = self.db_manager.save_professional(professional)
-                if unique_id:
-                    saved_count += 1
+            # Save professionals to database, displaying them while the write is in flight
+            save = self.db_manager.start_professionals_bulk_save(unique_professionals)
             
             # Display results
             self.display_manager.display_professionals_table(unique_professionals, "Last Run Dataset")
+            saved_count = self.db_manager.finish_professionals_bulk_save(save)
+            self._view_cache.clear()
             self.display_manager.display_search_summary("Last Run Dataset", len(unique_professionals), saved_count)
             
             print(f"\n🔍 Source: Last successful Apify run dataset")
@@ -236,96 +398,66 @@ class ProfessionalFinder:
     
     def _transform_results_from_last_run(self, results: List[Dict]) -> List[Dict]:
         """Transform results from last run without requiring city input"""
-        professionals = []
+        if not results:
+            return []
         
-        for i, result in enumerate(results):
-            try:
-                print(f"🔍 Processing result {i+1}/{len(results)}")
-                
-                # Extract city from the result data if available
-                city = self._extract_city_from_result(result)
-                print(f"📍 Extracted city: '{city}' (type: {type(city)})")
-                
-                # Handle different result formats from different actors
-                professional = self.apify_controller._extract_professional_data(result, city)
-                if professional:
-                    professionals.append(professional)
-                    print(f"✅ Successfully processed professional: {professional.get('first_name', 'N/A')} {professional.get('last_name', 'N/A')}")
-                else:
-                    print(f"⚠️  Failed to extract professional data from result {i+1}")
-            except Exception as e:
-                print(f"⚠️  Error transforming result {i+1}: {e}")
-                continue
+        # Cities differ per row here, but the schema does not: build the extractor once.
+        # Neither step raises (both fall back on malformed rows), so no per-row try is needed
+        extract = self.apify_controller._build_extractor(results[0])
+        normalize_city = self.apify_controller._normalize_city
+        extract_city = self._extract_city_from_result
+        
+        professionals = [p for r in results if (p := extract(r, normalize_city(extract_city(r))))]
+        
+        print(f"✅ Processed {len(professionals)}/{len(results)} results from last run")
+        failed = len(results) - len(professionals)
+        if failed:
+            print(f"⚠️  {failed} results could not be transformed")
         
         return professionals
     
     def _extract_city_from_result(self, result: Dict) -> str:
-        """Extract city information from a result item"""
-        try:
-            # Try to get city from location data if available
-            location = result.get('location', {})
-            if location:
-                # Try parsed location first
-                parsed_location = location.get('parsed', {})
-                if parsed_location and parsed_location.get('city'):
-                    city = parsed_location.get('city')
-                    if city and isinstance(city, str):
-                        return city
-                
-                # Try linkedin text
-                linkedin_text = location.get('linkedinText')
-                if linkedin_text and isinstance(linkedin_text, str):
-                    return linkedin_text
-            
-            # Try to get city from current position
-            current_position = result.get('currentPosition', [])
-            if current_position and len(current_position) > 0:
-                pos_location = current_position[0].get('location')
-                if pos_location and isinstance(pos_location, str):
-                    return pos_location
-            
-            # Try to get city from experience
-            experience = result.get('experience', [])
-            if experience and len(experience) > 0:
-                exp_location = experience[0].get('location')
-                if exp_location and isinstance(exp_location, str):
-                    return exp_location
-            
-            # Default fallback
-            return 'unknown'
-            
-        except Exception as e:
-            print(f"⚠️  Error extracting city from result: {e}")
-            return 'unknown'
+        """Extract city information from a result item (the first location found, or 'unknown')"""
+        for extract in CITY_EXTRACTORS:
+            try:
+                city = extract(result)
+            except (AttributeError, TypeError, KeyError):
+                continue  # A value of an unexpected type on this path (e.g. a string location)
+            if city and isinstance(city, str):
+                return city
+        return 'unknown'
+    
+    def _prompt_and_search(self):
+        """Ask for a city and search it"""
+        self.search_professionals_in_city(input("Enter city name: ").strip())
+    
+    def _prompt_and_view_city(self):
+        """Ask for a city and show its professionals"""
+        self.view_professionals_by_city(input("Enter city name: ").strip())
     
     def run_interactive_mode(self):
         """Run the application in interactive mode"""
+        # Menu choice -> action, built once per session (choice 6 exits)
+        actions = {
+            '1': self._prompt_and_search,
+            '2': self.view_all_professionals,
+            '3': self._prompt_and_view_city,
+            '4': lambda: self.display_manager.display_database_stats(self.db_manager),
+            '5': self.get_last_run_dataset,
+        }
+        
         while True:
             try:
                 self.display_manager.display_menu()
                 choice = input("\nEnter your choice (1-6): ").strip()
                 
-                if choice == '1':
-                    city = input("Enter city name: ").strip()
-                    self.search_professionals_in_city(city)
-                
-                elif choice == '2':
-                    self.view_all_professionals()
-                
-                elif choice == '3':
-                    city = input("Enter city name: ").strip()
-                    self.view_professionals_by_city(city)
-                
-                elif choice == '4':
-                    self.display_manager.display_database_stats(self.db_manager)
-                
-                elif choice == '5':
-                    self.get_last_run_dataset()
-                
-                elif choice == '6':
+                if choice == '6':
                     print("\n👋 Thank you for using Professional Finder!")
                     break
                 
+                action = actions.get(choice)
+                if action:
+                    action()
                 else:
                     self.display_manager.display_error("Invalid choice. Please enter 1-6.")
                 
@@ -337,38 +469,94 @@ class ProfessionalFinder:
             except Exception as e:
                 self.display_manager.display_error(f"Unexpected error: {e}")
     
-    def run_command_line_mode(self, city):
-        """Run the application in command line mode"""
+    def run_command_line_mode(self, cities):
+        """Run the application in command line mode for one or more cities"""
         try:
-            self.search_professionals_in_city(city)
+            if len(cities) == 1:
+                self.search_professionals_in_city(cities[0])
+            else:
+                self.search_professionals_in_cities(cities)
         except Exception as e:
             self.display_manager.display_error(f"Error in command line mode: {e}")
     
     def cleanup(self):
         """Clean up resources"""
+        if self.apify_controller:
+            self.apify_controller.close()
         if self.db_manager:
             self.db_manager.close()
 
+# Background thread writing queued log records, set by start_logging
+_log_listener = None
+
+def start_logging(level=logging.INFO):
+    """
+    Send log records through a queue to a background thread that writes them,
+    so logging calls in save and search loops never wait on console output.
+    Records go to stdout alongside print(). Returns the listener; stop it to
+    flush pending records
+    """
+    global _log_listener
+    log_queue = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter('%(message)s'))
+    listener = QueueListener(log_queue, console)
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    listener.start()
+    _log_listener = listener
+    return listener
+
+def flush_logging():
+    """
+    Write out every queued log record before returning, so tables and
+    summaries printed next do not interleave with search progress
+    """
+    if _log_listener is not None:
+        # stop() drains the queue and joins the thread; start a fresh one
+        _log_listener.stop()
+        _log_listener.start()
+
+USAGE = """Usage: python main.py [--refresh] [CITY ...]
+
+With no cities, starts the interactive menu.
+With one or more cities, searches them and saves the results, e.g.
+  python main.py "San Francisco" "Austin"
+
+--refresh  Ignore cached Apify results and start new actor runs
+"""
+
 def main():
     """Main entry point of the application"""
+    # Answer --help before connecting to anything
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print(USAGE)
+        return
+    
+    listener = start_logging()
+    
     print("🏢 Professional Finder Application")
     print("=" * 50)
     
-    # Check if running in command line mode
-    if len(sys.argv) > 1:
-        city = sys.argv[1]
-        app = ProfessionalFinder()
-        try:
-            app.run_command_line_mode(city)
-        finally:
-            app.cleanup()
-    else:
-        # Interactive mode
-        app = ProfessionalFinder()
+    args = sys.argv[1:]
+    force_refresh = '--refresh' in args
+    cities = [arg for arg in args if arg != '--refresh']
+    
+    try:
+        app = ProfessionalFinder(force_refresh=force_refresh)
         try:
-            app.run_interactive_mode()
+            # Check if running in command line mode
+            if cities:
+                app.run_command_line_mode(cities)
+            else:
+                # Interactive mode
+                app.run_interactive_mode()
         finally:
             app.cleanup()
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
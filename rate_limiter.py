@@ -0,0 +1,32 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket that spaces out calls to a rate-limited API
+    The bucket holds up to per_minute tokens and refills continuously; every
+    call takes one token, waiting for the refill when the bucket is empty.
+    Safe to share between worker threads
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = max(per_minute, 1)
+        self.rate = self.capacity / 60.0  # Tokens added per second
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed, then take a token for it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            # Sleep outside the lock so other threads can see the bucket
+            time.sleep(wait)
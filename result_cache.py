@@ -0,0 +1,72 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import json_codec
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """
+    Persistent SQLite cache for paid API results
+    Entries are keyed by a hash of the request and expire after a TTL, so
+    repeating an identical search does not start (and pay for) another run
+    """
+
+    def __init__(self, path: str, ttl: float):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, cached_at REAL NOT NULL, metadata BLOB, payload BLOB NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one transaction; one per operation keeps the cache safe to use from worker threads"""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Stable hash of JSON-serializable request parts"""
+        return hashlib.sha256(json_codec.dumps(parts, sort_keys=True)).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached payload for a key, or None if it is missing or expired"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT cached_at, payload FROM results WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None or time.time() - row[0] > self.ttl:
+                return None
+            return json_codec.loads(row[1])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("⚠️  Result cache read failed: %s", e)
+            return None
+
+    def set(self, key: str, payload: Any, metadata: Optional[Dict] = None):
+        """Store a payload with the time it was cached and optional metadata, dropping expired entries"""
+        try:
+            now = time.time()
+            with self._connect() as conn:
+                # Expired payloads are never served again; delete them so the file stays bounded
+                conn.execute("DELETE FROM results WHERE cached_at < ?", (now - self.ttl,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, cached_at, metadata, payload) VALUES (?, ?, ?, ?)",
+                    (key, now, json_codec.dumps(metadata or {}), json_codec.dumps(payload))
+                )
+        except (sqlite3.Error, TypeError) as e:
+            logger.warning("⚠️  Result cache write failed: %s", e)
@@ -1,10 +1,17 @@
 import google.generativeai as genai
-import json
+from google.api_core.exceptions import ResourceExhausted
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from database import DatabaseManager
+import json_codec
 from config import Config
+from rate_limiter import RateLimiter
+
+# "Please retry in 41.5s" in rate limit messages without structured RetryInfo
+RETRY_IN_RE = re.compile(r'retry in ([\d.]+)\s*s', re.IGNORECASE)
 
 class ProfessionalCreditScorer:
     """Professional Credit Scoring Algorithm using Google Gemini AI"""
@@ -15,6 +22,8 @@ class ProfessionalCreditScorer:
         
         genai.configure(api_key=Config.GEMINI_API_KEY)
         self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
+        # Shared by the concurrent batch requests
+        self.rate_limiter = RateLimiter(Config.GEMINI_RPM)
         self.db_manager = DatabaseManager()
         
         # Custom timeout settings for large datasets
@@ -106,27 +115,22 @@ class ProfessionalCreditScorer:
             
             print(f"📊 Processing {len(professionals)} professionals in {total_batches} batches of {batch_size}")
             
-            for batch_num in range(total_batches):
+            def analyze(batch_num):
                 start_idx = batch_num * batch_size
                 end_idx = min(start_idx + batch_size, len(professionals))
-                batch_professionals = professionals[start_idx:end_idx]
-                
                 print(f"\n🔄 Processing batch {batch_num + 1}/{total_batches} (profiles {start_idx + 1}-{end_idx})")
-                
-                # Send batch to Gemini for analysis
-                batch_result = self._analyze_batch(batch_professionals, batch_num + 1, total_batches)
-                
-                if batch_result:
-                    all_results.append(batch_result)
-                    print(f"✅ Batch {batch_num + 1} analysis completed successfully")
-                else:
-                    print(f"❌ Batch {batch_num + 1} analysis failed")
-                
-                # 60-second break between requests (except for the last batch)
-                if batch_num < total_batches - 1:
-                    print(f"⏰ Waiting 60 seconds before next batch...")
-                    import time
-                    time.sleep(60)
+                return self._analyze_batch(professionals[start_idx:end_idx], batch_num + 1, total_batches)
+            
+            # Batches are sent to Gemini concurrently; the rate limiter (GEMINI_RPM)
+            # spaces the requests out instead of a fixed wait between batches
+            workers = max(1, min(Config.GEMINI_MAX_CONCURRENCY, total_batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for batch_num, batch_result in enumerate(executor.map(analyze, range(total_batches))):
+                    if batch_result:
+                        all_results.append(batch_result)
+                        print(f"✅ Batch {batch_num + 1} analysis completed successfully")
+                    else:
+                        print(f"❌ Batch {batch_num + 1} analysis failed")
             
             # Aggregate all batch results
             if all_results:
@@ -148,7 +152,7 @@ class ProfessionalCreditScorer:
             analysis_prompt = self._prepare_analysis_prompt(batch_professionals, batch_num, total_batches)
             
             # Send to Gemini for analysis
-            analysis_result = self._get_gemini_analysis(analysis_prompt)
+            analysis_result = self._get_gemini_analysis(analysis_prompt, batch_num)
             
             if analysis_result:
                 # Add batch metadata
@@ -208,7 +212,7 @@ class ProfessionalCreditScorer:
         - Professionals in this batch: {len(professionals)}
         
         PROFESSIONAL DATASET (BATCH {batch_num}):
-        {json.dumps(data_summary['all_professionals'], indent=2)}
+        {json_codec.dumps_pretty(data_summary['all_professionals'])}
         
         IMPORTANT: Analyze the {len(professionals)} professionals in this batch.
         Calculate accurate years of experience for each professional and provide comprehensive statistical analysis.
@@ -218,20 +222,23 @@ class ProfessionalCreditScorer:
         
         return full_prompt
     
-    def _get_gemini_analysis(self, prompt: str) -> Optional[Dict]:
-        """Get analysis from Gemini AI with timeout and retry logic"""
-        import time
+    def _get_gemini_analysis(self, prompt: str, batch_num: Optional[int] = None) -> Optional[Dict]:
+        """
+        Get analysis from Gemini AI with timeout and retry logic
+        Messages are tagged with the batch number, since batches run concurrently
+        """
+        tag = f"Batch {batch_num}: " if batch_num else ""
         
         for attempt in range(self.max_retries):
             try:
-                print(f"🤖 Sending data to Gemini AI for analysis (attempt {attempt + 1}/{self.max_retries})...")
+                print(f"🤖 {tag}Sending data to Gemini AI for analysis (attempt {attempt + 1}/{self.max_retries})...")
                 
                 # Check prompt size and warn if very large
                 prompt_size = len(prompt)
-                print(f"📊 Prompt size: {prompt_size:,} characters")
+                print(f"📊 {tag}Prompt size: {prompt_size:,} characters")
                 
                 if prompt_size > 1000000:  # 1MB
-                    print("⚠️  Large dataset detected - this may take longer to process")
+                    print(f"⚠️  {tag}Large dataset detected - this may take longer to process")
                 
                 # Set generation config with timeout
                 generation_config = genai.types.GenerationConfig(
@@ -241,7 +248,8 @@ class ProfessionalCreditScorer:
                     max_output_tokens=8192,  # Maximum output tokens
                 )
                 
-                # Send request with timeout
+                # Send request with timeout, once the rate limit allows it
+                self.rate_limiter.acquire()
                 start_time = time.time()
                 response = self.model.generate_content(
                     prompt,
@@ -249,49 +257,71 @@ class ProfessionalCreditScorer:
                 )
                 end_time = time.time()
                 
-                print(f"✅ Gemini response received in {end_time - start_time:.2f} seconds")
+                print(f"✅ {tag}Gemini response received in {end_time - start_time:.2f} seconds")
                 content = response.text.strip()
                 
                 # Try to extract JSON from response
                 json_match = re.search(r'\{.*\}', content, re.DOTALL)
                 if json_match:
                     json_str = json_match.group()
-                    analysis = json.loads(json_str)
+                    analysis = json_codec.loads(json_str)
                     
                     # Validate the analysis structure
                     if self._validate_analysis(analysis):
-                        print("✅ Analysis structure validated successfully")
+                        print(f"✅ {tag}Analysis structure validated successfully")
                         return analysis
                     else:
-                        print("⚠️  Analysis structure validation failed")
+                        print(f"⚠️  {tag}Analysis structure validation failed")
                         return self._parse_text_analysis(content)
                 else:
-                    print("⚠️  Could not parse JSON response from Gemini")
+                    print(f"⚠️  {tag}Could not parse JSON response from Gemini")
                     return self._parse_text_analysis(content)
                     
+            except ResourceExhausted as e:
+                # Rate limited: wait as long as Gemini asks rather than a fixed backoff
+                delay = self._retry_delay(e)
+                if attempt < self.max_retries - 1:
+                    print(f"⏳ {tag}Gemini rate limit reached. Retrying in {delay:.1f} seconds...")
+                    time.sleep(delay)
+                    continue
+                print(f"❌ {tag}All retry attempts were rate limited")
+                return None
             except Exception as e:
                 error_msg = str(e)
-                print(f"❌ Error on attempt {attempt + 1}: {error_msg}")
+                print(f"❌ {tag}Error on attempt {attempt + 1}: {error_msg}")
                 
                 # Check if it's a timeout error
                 if "504" in error_msg or "timeout" in error_msg.lower() or "deadline" in error_msg.lower():
-                    print(f"⏰ Timeout detected. Retrying in {2 ** attempt} seconds...")
+                    print(f"⏰ {tag}Timeout detected. Retrying in {2 ** attempt} seconds...")
                     if attempt < self.max_retries - 1:
                         time.sleep(2 ** attempt)  # Exponential backoff
                         continue
                     else:
-                        print("❌ All retry attempts failed due to timeout")
-                        return self._handle_large_dataset_fallback(prompt)
+                        print(f"❌ {tag}All retry attempts failed due to timeout")
+                        return self._handle_large_dataset_fallback(prompt, batch_num)
                 
                 # For other errors, don't retry
-                print(f"❌ Non-timeout error: {error_msg}")
+                print(f"❌ {tag}Non-timeout error: {error_msg}")
                 return None
         
         return None
     
-    def _handle_large_dataset_fallback(self, prompt: str) -> Dict:
+    @staticmethod
+    def _retry_delay(error: ResourceExhausted) -> float:
+        """Seconds Gemini asks to wait after a rate limit error (its RetryInfo), or a full quota window"""
+        for detail in error.details or []:
+            retry_delay = getattr(detail, 'retry_delay', None)
+            if retry_delay is not None:
+                return retry_delay.seconds + retry_delay.nanos / 1e9
+        match = RETRY_IN_RE.search(str(error))
+        if match:
+            return float(match.group(1))
+        return 60.0
+    
+    def _handle_large_dataset_fallback(self, prompt: str, batch_num: Optional[int] = None) -> Dict:
         """Handle large datasets that cause timeouts by using manual calculations"""
-        print("🔄 Falling back to manual calculations for large dataset...")
+        tag = f"Batch {batch_num}: " if batch_num else ""
+        print(f"🔄 {tag}Falling back to manual calculations for large dataset...")
         
         try:
             # Extract professional data from the prompt (limited to 50 profiles)
@@ -299,7 +329,7 @@ class ProfessionalCreditScorer:
             json_match = re.search(r'"all_professionals":\s*(\[.*?\])', prompt, re.DOTALL)
             if json_match:
                 professionals_json = json_match.group(1)
-                professionals = json.loads(professionals_json)
+                professionals = json_codec.loads(professionals_json)
                 
                 # Calculate metrics manually for the limited dataset
                 manual_metrics = self.calculate_experience_metrics(professionals)
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Test script for the Apify controller
+This script tests the controller's HTTP handling without making real API calls.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+import json_codec
+from apify_controller import ApifyController
+from config import Config
+from result_cache import ResultCache
+
+
+def make_response(status_code=200, payload=None, text='', headers=None):
+    """Build a mock HTTP response"""
+    response = Mock()
+    response.status_code = status_code
+    response.content = json_codec.dumps(payload) if payload is not None else b''
+    response.text = text
+    response.headers = headers or {}
+    return response
+
+
+class TestApifyController(unittest.TestCase):
+    """Test cases for ApifyController class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        with patch.object(Config, 'APIFY_API_TOKEN', 'test_token'), \
+             patch.object(Config, 'APIFY_CACHE_TTL', 0):
+            self.controller = ApifyController()
+        self.controller.session = Mock()
+
+    def tearDown(self):
+        """Clean up after tests"""
+        self.controller.close()
+
+    @patch('apify_controller.time.sleep')
+    def test_wait_for_run_completion_backs_off(self, mock_sleep):
+        """Test that status polling backs off between non-terminal statuses"""
+        self.controller.session.get.side_effect = [
+            make_response(payload={'data': {'status': 'READY'}}),
+            make_response(payload={'data': {'status': 'RUNNING'}}),
+            make_response(payload={'data': {'status': 'RUNNING'}}),
+            make_response(payload={'data': {'status': 'SUCCEEDED'}}),
+        ]
+
+        self.assertTrue(self.controller._wait_for_run_completion('run123'))
+
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertEqual(delays, [1.0, 1.5, 2.25])
+        params = self.controller.session.get.call_args.kwargs['params']
+        self.assertEqual(params, {'waitForFinish': 60})
+
+    @patch('apify_controller.time.sleep')
+    @patch('apify_controller.time.monotonic')
+    def test_wait_for_run_completion_skips_sleep_after_long_poll(self, mock_monotonic, mock_sleep):
+        """Test that a status request held open for the full wait is not followed by a sleep"""
+        clock = iter([0, 0, 0, 60, 60, 60, 120, 120])
+        mock_monotonic.side_effect = lambda: next(clock)
+        self.controller.session.get.side_effect = [
+            make_response(payload={'data': {'status': 'RUNNING'}}),
+            make_response(payload={'data': {'status': 'SUCCEEDED'}}),
+        ]
+
+        self.assertTrue(self.controller._wait_for_run_completion('run123', timeout=3600))
+        mock_sleep.assert_not_called()
+
+    @patch('apify_controller.time.sleep')
+    def test_wait_for_run_completion_failed_status(self, mock_sleep):
+        """Test that a failed run stops polling"""
+        self.controller.session.get.return_value = make_response(payload={'data': {'status': 'ABORTED'}})
+
+        self.assertFalse(self.controller._wait_for_run_completion('run123'))
+        mock_sleep.assert_not_called()
+
+    @patch('apify_controller.time.sleep')
+    def test_run_skips_polling_when_already_finished(self, mock_sleep):
+        """Test that a run reported finished on start is not polled"""
+        self.controller.session.post.return_value = make_response(
+            status_code=201,
+            payload={'data': {'id': 'run123', 'defaultDatasetId': 'ds123', 'status': 'SUCCEEDED'}}
+        )
+        self.controller.session.get.return_value = make_response(payload=[])
+
+        self.controller._run_and_fetch_items('actor', {'locations': ['Austin']}, 10)
+
+        requested_urls = [call.args[0] for call in self.controller.session.get.call_args_list]
+        self.assertFalse(any('/actor-runs/' in url for url in requested_urls))
+        mock_sleep.assert_not_called()
+
+    def test_small_search_waits_for_the_run_on_start(self):
+        """Test that small searches wait for the run in the start request and skip polling"""
+        self.controller.session.post.return_value = make_response(
+            status_code=201,
+            payload={'data': {'id': 'run123', 'defaultDatasetId': 'ds123', 'status': 'SUCCEEDED'}}
+        )
+        items = make_response(headers={'X-Apify-Pagination-Total': '1'})
+        items.iter_lines.return_value = iter([b'{"id": "abc", "firstName": "Jane", "lastName": "Doe"}'])
+        self.controller.session.get.return_value = items
+
+        professionals = self.controller._run_actor_and_get_results('actor', {'locations': ['Austin']}, 10)
+
+        self.assertEqual(self.controller.session.post.call_count, 1)
+        post = self.controller.session.post.call_args
+        self.assertTrue(post.args[0].endswith('/acts/actor/runs'))
+        self.assertEqual(post.kwargs['params'], {'waitForFinish': ApifyController.POLL_WAIT_FOR_FINISH})
+        self.assertEqual(json_codec.loads(post.kwargs['data']), {'locations': ['Austin']})
+        requested_urls = [call.args[0] for call in self.controller.session.get.call_args_list]
+        self.assertEqual(requested_urls, ['https://api.apify.com/v2/datasets/ds123/items'])
+        self.assertEqual(len(professionals), 1)
+        self.assertEqual(professionals[0]['first_name'], 'Jane')
+        self.assertEqual(professionals[0]['city'], 'austin')
+
+    def test_unfinished_run_is_polled_by_its_own_id(self):
+        """Test that a run still going after the start wait is followed by its run id, never 'last'"""
+        self.controller.session.post.return_value = make_response(
+            status_code=201,
+            payload={'data': {'id': 'run123', 'defaultDatasetId': 'ds123', 'status': 'RUNNING'}}
+        )
+        items = make_response(headers={'X-Apify-Pagination-Total': '1'})
+        items.iter_lines.return_value = iter([b'{"id": "a"}'])
+        self.controller.session.get.side_effect = [
+            make_response(payload={'data': {'status': 'SUCCEEDED'}}),
+            items
+        ]
+
+        results = list(self.controller._run_and_fetch_items('actor', {}, 10, wait_for_finish=60))
+
+        self.assertEqual(results, [{'id': 'a'}])
+        requested_urls = [call.args[0] for call in self.controller.session.get.call_args_list]
+        self.assertTrue(requested_urls[0].endswith('/actor-runs/run123'))
+        self.assertFalse(any(url.endswith('/runs/last') for url in requested_urls))
+
+    def test_error_body_is_truncated_in_logs(self):
+        """Test that large error bodies are cut down before being logged"""
+        self.controller.session.get.return_value = make_response(status_code=500, text='x' * 10000)
+
+        with self.assertLogs('apify_controller', level='ERROR') as logs:
+            self.assertIsNone(self.controller._get_run_status('run123'))
+
+        self.assertIn('Response text: ' + 'x' * 500, logs.output[-1])
+        self.assertNotIn('x' * 501, logs.output[-1])
+
+    def test_cached_get_revalidates_with_etag(self):
+        """Test that repeat GETs send If-None-Match and reuse the payload on 304"""
+        self.controller.session.get.side_effect = [
+            make_response(payload={'name': 'actor'}, headers={'ETag': '"v1"'}),
+            make_response(status_code=304),
+        ]
+        url = 'https://api.apify.com/v2/acts/actor'
+
+        _, first = self.controller._cached_get(url)
+        response, second = self.controller._cached_get(url)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(second, first)
+        first_headers = self.controller.session.get.call_args_list[0].kwargs['headers']
+        second_headers = self.controller.session.get.call_args_list[1].kwargs['headers']
+        self.assertIsNone(first_headers)
+        self.assertEqual(second_headers, {'If-None-Match': '"v1"'})
+        response.close.assert_called_once()
+
+    def test_dataset_pages_are_not_etag_cached(self):
+        """Test that dataset pages bypass the ETag cache and release their connection"""
+        response = make_response(headers={'ETag': '"v1"', 'X-Apify-Pagination-Total': '1'})
+        response.iter_lines.return_value = iter([b'{"id": 1}'])
+        self.controller.session.get.return_value = response
+
+        self.assertEqual(self.controller._get_dataset_items('ds123', 10), [{'id': 1}])
+
+        self.assertEqual(self.controller._etag_cache, {})
+        self.assertIsNone(self.controller.session.get.call_args.kwargs.get('headers'))
+        response.close.assert_called_once()
+
+    def test_get_dataset_items_streams_jsonl(self):
+        """Test that dataset items are requested and parsed as JSON Lines"""
+        response = make_response()
+        response.iter_lines.return_value = iter([b'{"id": "a"}', b'', b'{"id": "b"}'])
+        self.controller.session.get.return_value = response
+
+        items = self.controller._get_dataset_items('ds123', 10)
+
+        self.assertEqual(items, [{'id': 'a'}, {'id': 'b'}])
+        call = self.controller.session.get.call_args
+        self.assertEqual(call.kwargs['params']['format'], 'jsonl')
+        self.assertIn('firstName', call.kwargs['params']['fields'].split(','))
+        self.assertTrue(call.kwargs['stream'])
+
+    def test_get_dataset_items_paginates(self):
+        """Test that datasets larger than one page are fetched page by page, in order"""
+        pages = {0: [b'{"id": 1}', b'{"id": 2}'], 2: [b'{"id": 3}', b'{"id": 4}'], 4: [b'{"id": 5}']}
+
+        def get(url, params=None, **kwargs):
+            response = make_response(headers={'X-Apify-Pagination-Total': '5'})
+            response.iter_lines.return_value = iter(pages.get(params['offset'], []))
+            return response
+
+        self.controller.session.get.side_effect = get
+
+        with patch.object(ApifyController, 'DATASET_PAGE_SIZE', 2):
+            items = self.controller._get_dataset_items('ds123', 10)
+
+        self.assertEqual([item['id'] for item in items], [1, 2, 3, 4, 5])
+        offsets = sorted(call.kwargs['params']['offset'] for call in self.controller.session.get.call_args_list)
+        self.assertEqual(offsets, [0, 2, 4])
+
+    def test_get_dataset_items_continues_after_short_clean_page(self):
+        """Test that a page shortened by clean=true does not end paging while the total says more remain"""
+        pages = {0: [b'{"id": 1}'], 2: [b'{"id": 3}', b'{"id": 4}']}
+
+        def get(url, params=None, **kwargs):
+            response = make_response(headers={'X-Apify-Pagination-Total': '4'})
+            response.iter_lines.return_value = iter(pages.get(params['offset'], []))
+            return response
+
+        self.controller.session.get.side_effect = get
+
+        with patch.object(ApifyController, 'DATASET_PAGE_SIZE', 2):
+            items = self.controller._get_dataset_items('ds123', 10)
+
+        self.assertEqual([item['id'] for item in items], [1, 3, 4])
+
+    def test_get_dataset_items_stops_at_total(self):
+        """Test that a dataset that fits in the first page needs a single request"""
+        response = make_response(headers={'X-Apify-Pagination-Total': '1'})
+        response.iter_lines.return_value = iter([b'{"id": 1}'])
+        self.controller.session.get.return_value = response
+
+        with patch.object(ApifyController, 'DATASET_PAGE_SIZE', 2):
+            items = self.controller._get_dataset_items('ds123', 10)
+
+        self.assertEqual(items, [{'id': 1}])
+        self.assertEqual(self.controller.session.get.call_count, 1)
+
+    def test_get_dataset_items_without_total_pages_until_empty(self):
+        """Test that without pagination headers pages are fetched until one comes back empty"""
+        pages = {0: [b'{"id": 1}'], 2: [b'{"id": 3}']}
+
+        def get(url, params=None, **kwargs):
+            response = make_response()
+            response.iter_lines.return_value = iter(pages.get(params['offset'], []))
+            return response
+
+        self.controller.session.get.side_effect = get
+
+        with patch.object(ApifyController, 'DATASET_PAGE_SIZE', 2):
+            items = self.controller._get_dataset_items('ds123', 10)
+
+        self.assertEqual([item['id'] for item in items], [1, 3])
+        self.assertEqual(self.controller.session.get.call_count, 3)
+
+    @patch('apify_controller.time.sleep')
+    def test_search_professionals_batch_polls_runs_together(self, mock_sleep):
+        """Test that a batch search starts every run first and polls them together"""
+        runs = {
+            'Austin': {'id': 'run1', 'defaultDatasetId': 'ds1', 'status': 'READY'},
+            'Denver': {'id': 'run2', 'defaultDatasetId': 'ds2', 'status': 'READY'},
+        }
+        statuses = {'run1': iter(['RUNNING', 'SUCCEEDED']), 'run2': iter(['SUCCEEDED'])}
+        datasets = {
+            'ds1': [{'id': 'a', 'firstName': 'Ann'}],
+            'ds2': [{'id': 'b', 'firstName': 'Bob'}],
+        }
+
+        with patch.object(self.controller, '_start_actor_run',
+                          side_effect=lambda actor_id, input_data: runs[input_data['locations'][0]]), \
+             patch.object(self.controller, '_get_run_status',
+                          side_effect=lambda run_id: next(statuses[run_id])), \
+             patch.object(self.controller, '_get_dataset_items',
+                          side_effect=lambda dataset_id, max_results: datasets[dataset_id]):
+            results = self.controller.search_professionals_batch(['Austin', 'Denver'], max_results=10)
+
+        self.assertEqual(results['Austin'][0]['first_name'], 'Ann')
+        self.assertEqual(results['Austin'][0]['city'], 'austin')
+        self.assertEqual(results['Denver'][0]['first_name'], 'Bob')
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_search_professionals_batch_skips_runs_that_fail_to_start(self):
+        """Test that a city whose run fails to start gets no results"""
+        with patch.object(self.controller, '_start_actor_run', return_value=None):
+            results = self.controller.search_professionals_batch(['Austin'], max_results=10)
+
+        self.assertEqual(results, {'Austin': []})
+
+    def test_transform_results_harvestapi_fixture(self):
+        """Test that the HarvestAPI sample dataset transforms row for row"""
+        with open('data/test.json') as f:
+            results = json.load(f)
+
+        professionals = self.controller._transform_results(results, 'Austin')
+
+        self.assertEqual(len(professionals), len(results))
+        self.assertEqual(professionals[0]['first_name'], results[0]['firstName'])
+        self.assertEqual(professionals[0]['last_name'], results[0]['lastName'])
+        self.assertTrue(all(p['city'] == 'austin' for p in professionals))
+
+    def test_transform_results_splits_full_name(self):
+        """Test that actors returning a single name field are split into first and last"""
+        results = [{'id': 'a', 'fullName': 'Jane van Doe'}, {'id': 'b', 'fullName': 'Cher'}]
+
+        professionals = self.controller._transform_results(results, 'Austin')
+
+        self.assertEqual((professionals[0]['first_name'], professionals[0]['last_name']), ('Jane', 'van Doe'))
+        self.assertEqual((professionals[1]['first_name'], professionals[1]['last_name']), ('Cher', ''))
+
+    def test_transform_results_handles_empty_name(self):
+        """Test that empty or missing name fields give empty first and last names"""
+        results = [{'id': 'a', 'name': ''}, {'id': 'b', 'name': None}, {'id': 'c'}]
+
+        professionals = self.controller._transform_results(results, 'Austin')
+
+        self.assertEqual([(p['first_name'], p['last_name']) for p in professionals], [('', '')] * 3)
+
+    def test_iter_professionals_is_lazy(self):
+        """Test that results are transformed as they are consumed"""
+        consumed = []
+
+        def results():
+            for i in range(3):
+                consumed.append(i)
+                yield {'id': str(i), 'firstName': f'P{i}'}
+
+        professionals = self.controller._iter_professionals(results(), 'Austin')
+
+        self.assertEqual(next(professionals)['first_name'], 'P0')
+        self.assertEqual(consumed, [0])
+        self.assertEqual([p['first_name'] for p in professionals], ['P1', 'P2'])
+
+    def test_extract_professional_data_normalizes_city(self):
+        """Test that single-row extraction lower-cases the city and handles a missing one"""
+        result = {'id': 'a', 'firstName': 'Jane'}
+
+        self.assertEqual(self.controller._extract_professional_data(result, 'Austin')['city'], 'austin')
+        self.assertEqual(self.controller._extract_professional_data(result, None)['city'], 'unknown')
+
+    def test_preflight_checks_are_cached(self):
+        """Test that successful preflight checks only hit the API once unless refreshed"""
+        self.controller.session.get.return_value = make_response(payload={'data': {'name': 'ok'}})
+
+        self.assertEqual(self.controller.preflight('actor'), (True, True))
+        self.assertEqual(self.controller.preflight('actor'), (True, True))
+        self.assertEqual(self.controller.session.get.call_count, 2)
+
+        self.assertTrue(self.controller.test_api_connection(refresh=True))
+        self.assertEqual(self.controller.session.get.call_count, 3)
+
+    def test_failed_preflight_check_is_retried(self):
+        """Test that a failed check is not cached"""
+        self.controller.session.get.return_value = make_response(status_code=401)
+
+        self.assertFalse(self.controller.test_api_connection())
+        self.assertFalse(self.controller.test_api_connection())
+        self.assertEqual(self.controller.session.get.call_count, 2)
+
+    def test_get_last_run_dataset_and_info(self):
+        """Test that the last run's info and items are fetched together"""
+        def get(url, **kwargs):
+            if url.endswith('/runs/last'):
+                return make_response(payload={'data': {'id': 'run1'}})
+            return make_response(payload=[{'id': 'a'}])
+        self.controller.session.get.side_effect = get
+
+        info, items = self.controller.get_last_run_dataset_and_info('actor', max_results=5)
+
+        self.assertEqual(info, {'id': 'run1'})
+        self.assertEqual(items, [{'id': 'a'}])
+        self.assertEqual(self.controller.session.get.call_count, 2)
+
+    def test_repeat_search_is_served_from_result_cache(self):
+        """Test that an identical search reuses cached results instead of starting a run"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.controller.result_cache = ResultCache(os.path.join(tmp, 'cache.sqlite'), ttl=60)
+            self.controller.session.post.return_value = make_response(
+                status_code=201,
+                payload={'data': {'id': 'run123', 'defaultDatasetId': 'ds123', 'status': 'SUCCEEDED'}}
+            )
+
+            def get(url, **kwargs):
+                response = make_response(headers={'X-Apify-Pagination-Total': '1'})
+                response.iter_lines.return_value = iter([b'{"id": "abc", "firstName": "Jane", "lastName": "Doe"}'])
+                return response
+            self.controller.session.get.side_effect = get
+
+            first = self.controller.search_professionals_with_linkedin_scraper('Austin')
+            second = self.controller.search_professionals_with_linkedin_scraper('Austin')
+            self.assertEqual(second, first)
+            self.assertEqual(self.controller.session.post.call_count, 1)
+
+            self.controller.search_professionals_with_linkedin_scraper('Austin', force_refresh=True)
+            self.assertEqual(self.controller.session.post.call_count, 2)
+
+    def test_batch_search_only_runs_uncached_cities(self):
+        """Test that a batch search starts runs only for cities missing from the cache"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.controller.result_cache = ResultCache(os.path.join(tmp, 'cache.sqlite'), ttl=60)
+            cached = [{'first_name': 'Ann', 'city': 'austin'}]
+            self.controller._cache_results(
+                self.controller.LINKEDIN_SEARCH_ACTOR_ID,
+                self.controller._build_search_input('Austin', 10),
+                cached
+            )
+
+            with patch.object(self.controller, '_start_actor_run', return_value=None) as mock_start:
+                results = self.controller.search_professionals_batch(['Austin', 'Denver'], max_results=10)
+
+            self.assertEqual(results, {'Austin': cached, 'Denver': []})
+            self.assertEqual(mock_start.call_count, 1)
+            self.assertEqual(mock_start.call_args.args[1]['locations'], ['Denver'])
+
+    def test_batch_search_runs_in_waves(self):
+        """Test that a batch larger than the concurrent run limit is run in waves"""
+        with patch.object(Config, 'APIFY_MAX_CONCURRENT_RUNS', 2), \
+             patch.object(self.controller, '_run_batch', return_value={}) as mock_run_batch:
+            self.controller.search_professionals_batch(['A', 'B', 'C', 'D', 'E'], max_results=10)
+
+        waves = [[city for city, _ in call.args[0]] for call in mock_run_batch.call_args_list]
+        self.assertEqual(waves, [['A', 'B'], ['C', 'D'], ['E']])
+
+if __name__ == "__main__":
+    unittest.main()
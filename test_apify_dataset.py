@@ -5,6 +5,7 @@ This script tests the Apify API integration with detailed logging.
 """
 
 import os
+import logging
 from dotenv import load_dotenv
 from apify_controller import ApifyController
 
@@ -60,6 +61,8 @@ def test_apify_dataset_retrieval():
         return False
 
 if __name__ == "__main__":
+    # Show the controller's request/response details
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
     success = test_apify_dataset_retrieval()
     if success:
         print("\n✅ Apify dataset retrieval test completed")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Test script for the database manager
+This script tests DatabaseManager against a mocked MongoDB collection.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from database import DatabaseManager
+
+
+class TestDatabaseManager(unittest.TestCase):
+    """Test cases for DatabaseManager class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        with patch.object(DatabaseManager, 'connect'):
+            self.db_manager = DatabaseManager()
+        self.db_manager.collection = Mock()
+
+    def test_constructor_does_not_connect(self):
+        """Test that creating a manager does not touch MongoDB until it is used"""
+        with patch('database.MongoClient') as mock_client, patch('database._client', None), \
+             patch('database._indexes_created', False):
+            db_manager = DatabaseManager()
+            mock_client.assert_not_called()
+
+            db_manager.get_statistics()
+            mock_client.assert_called_once()
+
+    def test_managers_share_one_client(self):
+        """Test that every manager reuses the same MongoClient and indexes are created once"""
+        with patch('database.MongoClient') as mock_client, patch('database._client', None), \
+             patch('database._indexes_created', False):
+            collection = mock_client.return_value.__getitem__.return_value.__getitem__.return_value
+            collection.list_indexes.return_value = [{'name': '_id_'}, {'name': 'company_1'}]
+            first, second = DatabaseManager(), DatabaseManager()
+            first.get_statistics()
+            first.close()
+            second.get_statistics()
+
+            mock_client.assert_called_once()
+            collection.list_indexes.assert_called_once()
+            collection.create_indexes.assert_called_once_with(DatabaseManager.INDEXES)
+            collection.create_index.assert_not_called()
+            collection.drop_index.assert_called_once_with('company_1')
+
+    def test_existing_indexes_need_no_further_round_trips(self):
+        """Test that with every index in place only listIndexes is sent"""
+        self.db_manager.collection.list_indexes.return_value = [
+            {'name': '_id_'}, {'name': 'linkedinId_1', 'unique': True}
+        ] + [{'name': index.document['name']} for index in DatabaseManager.INDEXES[1:]]
+
+        self.db_manager._create_indexes()
+
+        self.db_manager.collection.create_indexes.assert_not_called()
+        self.db_manager.collection.create_index.assert_not_called()
+        self.db_manager.collection.drop_index.assert_not_called()
+
+    def test_non_unique_linkedin_id_index_is_upgraded(self):
+        """Test that an older non-unique linkedinId index is replaced by the unique one"""
+        self.db_manager.collection.list_indexes.return_value = [{'name': 'linkedinId_1'}]
+
+        self.db_manager._create_indexes()
+
+        self.db_manager.collection.drop_index.assert_called_once_with('linkedinId_1')
+        self.db_manager.collection.create_index.assert_called_once_with('linkedinId', unique=True, sparse=True)
+        created = [index.document['name'] for index in self.db_manager.collection.create_indexes.call_args.args[0]]
+        self.assertNotIn('linkedinId_1', created)
+
+    def test_index_conflict_falls_back_to_one_at_a_time(self):
+        """Test that one conflicting index does not stop the others from being created"""
+        self.db_manager.collection.list_indexes.return_value = []
+        self.db_manager.collection.create_indexes.side_effect = [OperationFailure('conflict', 85)] + [None] * len(DatabaseManager.INDEXES)
+
+        self.db_manager._create_indexes()
+
+        self.assertEqual(self.db_manager.collection.create_indexes.call_count, 1 + len(DatabaseManager.INDEXES))
+
+    def test_get_statistics_uses_single_aggregation(self):
+        """Test that statistics come from one $facet aggregation in the existing shape"""
+        self.db_manager.collection.aggregate.return_value = iter([{
+            'by_source': [{'_id': 'HarvestAPI LinkedIn', 'c': 4}, {'_id': 'Gemini AI', 'c': 1}, {'_id': None, 'c': 1}],
+            'cities': [{'_id': 'austin'}, {'_id': 'boston'}, {'_id': None}],
+        }])
+
+        stats = self.db_manager.get_statistics()
+
+        self.db_manager.collection.aggregate.assert_called_once()
+        self.db_manager.collection.count_documents.assert_not_called()
+        self.db_manager.collection.distinct.assert_not_called()
+        self.assertEqual(stats, {
+            'total_professionals': 6,
+            'unique_cities': 2,
+            'unique_sources': 2,
+            'source_counts': {'HarvestAPI LinkedIn': 4, 'Gemini AI': 1},
+            'cities': ['austin', 'boston'],
+        })
+
+    def test_get_statistics_empty_collection(self):
+        """Test that an empty collection reports zero totals"""
+        self.db_manager.collection.aggregate.return_value = iter([{'by_source': [], 'cities': []}])
+
+        stats = self.db_manager.get_statistics()
+
+        self.assertEqual(stats['total_professionals'], 0)
+        self.assertEqual(stats['source_counts'], {})
+
+    def test_get_city_source_counts_groups_on_server(self):
+        """Test that city/source counts come from a $group aggregation instead of a full fetch"""
+        rows = [{'_id': {'city': 'austin', 'source': 'HarvestAPI LinkedIn'}, 'c': 3}]
+        self.db_manager.collection.aggregate.return_value = iter(rows)
+
+        self.assertEqual(self.db_manager.get_city_source_counts(), rows)
+        self.db_manager.collection.find.assert_not_called()
+        pipeline = self.db_manager.collection.aggregate.call_args.args[0]
+        self.assertEqual(pipeline[0]['$group']['_id'], {'city': '$city', 'source': '$source'})
+
+    def test_get_professionals_by_source_projection(self):
+        """Test that requested fields become a projection and no fields means full documents"""
+        self.db_manager.collection.find.return_value = []
+
+        self.db_manager.get_professionals_by_source('Gemini AI', fields=DatabaseManager.LIST_VIEW_FIELDS)
+        projection = self.db_manager.collection.find.call_args.args[1]
+        self.assertEqual(projection['_id'], 0)
+        self.assertEqual(set(projection) - {'_id'}, set(DatabaseManager.LIST_VIEW_FIELDS))
+
+        self.db_manager.get_professionals_by_source('Gemini AI')
+        self.assertIsNone(self.db_manager.collection.find.call_args.args[1])
+
+    def test_iter_all_professionals_streams_cursor(self):
+        """Test that the streaming read returns the batched cursor itself, sorted by collated city on request"""
+        cursor = self.db_manager.collection.find.return_value
+
+        self.assertIs(self.db_manager.iter_all_professionals(fields=('city',)), cursor)
+        self.assertEqual(self.db_manager.collection.find.call_args.kwargs['batch_size'], 500)
+        cursor.sort.assert_not_called()
+
+        sorted_cursor = cursor.collation.return_value.sort.return_value
+        self.assertIs(self.db_manager.iter_all_professionals(sort_by_city=True), sorted_cursor)
+        cursor.collation.return_value.sort.assert_called_once_with('city', 1)
+
+    def test_list_view_projection_truncates_on_server(self):
+        """Test that the list view projection passes through unchanged and cuts long text in MongoDB"""
+        self.db_manager.collection.find.return_value = []
+
+        self.db_manager.get_professionals_by_city('Austin', fields=DatabaseManager.LIST_VIEW_PROJECTION)
+
+        projection = self.db_manager.collection.find.call_args.args[1]
+        self.assertEqual(projection['_id'], 0)
+        self.assertEqual(projection['first_name'], 1)
+        self.assertEqual(projection['headline']['$cond'][1], {'$concat': [{'$substrCP': ['$headline', 0, 30]}, '...']})
+        self.assertNotIn('_id', DatabaseManager.LIST_VIEW_PROJECTION)
+
+    def test_background_bulk_save_prepares_documents_before_returning(self):
+        """Test that a background save assigns IDs up front and reports the same count as a direct save"""
+        self.db_manager.collection.bulk_write.return_value = Mock(upserted_count=1, matched_count=1)
+        professionals = [{'linkedinId': 'abc'}, {'linkedinId': 'def'}]
+
+        future = self.db_manager.start_professionals_bulk_save(professionals)
+        self.assertTrue(all('unique_id' in professional for professional in professionals))
+
+        self.assertEqual(self.db_manager.finish_professionals_bulk_save(future), 2)
+        self.db_manager.collection.bulk_write.assert_called_once()
+        self.db_manager.close()
+        self.assertIsNone(self.db_manager._write_executor)
+
+    def test_save_professionals_bulk_uses_one_bulk_write(self):
+        """Test that a batch of professionals is saved with a single unordered bulk write"""
+        self.db_manager.collection.bulk_write.return_value = Mock(upserted_count=1, matched_count=1)
+        professionals = [
+            {'linkedinId': 'abc', 'first_name': 'Jane', 'last_name': 'Doe'},
+            {'first_name': 'John', 'last_name': None, 'company': 'Acme', 'city': 'austin'},
+        ]
+
+        saved = self.db_manager.save_professionals_bulk(professionals)
+
+        self.assertEqual(saved, 2)
+        self.db_manager.collection.bulk_write.assert_called_once()
+        self.db_manager.collection.find_one.assert_not_called()
+        operations = self.db_manager.collection.bulk_write.call_args.args[0]
+        self.assertFalse(self.db_manager.collection.bulk_write.call_args.kwargs['ordered'])
+        self.assertEqual(operations[0]._filter, {'linkedinId': 'abc'})
+        self.assertEqual(operations[1]._filter, {'first_name': 'John', 'last_name': '', 'company': 'Acme', 'city': 'austin'})
+        self.assertIsNone(operations[0]._collation)
+        self.assertEqual(operations[1]._collation.document, {'locale': 'en', 'strength': 2})
+        self.assertTrue(all(op._upsert for op in operations))
+        inserted = operations[0]._doc['$setOnInsert']
+        self.assertEqual(len(inserted['unique_id']), 24)
+        self.assertIsNotNone(inserted['created_at'].tzinfo)
+        self.assertEqual(inserted['source'], 'Unknown')
+        self.assertEqual(inserted['created_at'], operations[1]._doc['$setOnInsert']['created_at'])
+
+    def test_save_professionals_bulk_counts_partial_failures(self):
+        """Test that successful writes are still counted when some fail"""
+        self.db_manager.collection.bulk_write.side_effect = BulkWriteError(
+            {'nUpserted': 2, 'nMatched': 0, 'writeErrors': [{'index': 2}]}
+        )
+
+        saved = self.db_manager.save_professionals_bulk([{'first_name': str(i)} for i in range(3)])
+
+        self.assertEqual(saved, 2)
+
+    def test_save_professional_returns_existing_id(self):
+        """Test that saving a duplicate returns the stored copy's ID in one round trip"""
+        self.db_manager.collection.find_one_and_update.return_value = {'unique_id': 'existing'}
+
+        unique_id = self.db_manager.save_professional({'linkedinId': 'abc', 'first_name': 'Jane'})
+
+        self.assertEqual(unique_id, 'existing')
+        self.db_manager.collection.find_one.assert_not_called()
+        self.db_manager.collection.insert_one.assert_not_called()
+
+    def test_list_view_fields_are_projected(self):
+        """Test that requesting fields sends a projection and leaves _id out"""
+        self.db_manager.collection.find.return_value = []
+
+        self.db_manager.get_all_professionals(fields=('first_name', 'city'))
+        self.db_manager.get_professionals_by_city('Austin', fields=('first_name',))
+
+        all_call, city_call = self.db_manager.collection.find.call_args_list
+        self.assertEqual(all_call.args, ({}, {'first_name': 1, 'city': 1, '_id': 0}))
+        self.assertEqual(city_call.args, ({'city': 'Austin'}, {'first_name': 1, '_id': 0}))
+        self.assertEqual(city_call.kwargs['collation'].document, {'locale': 'en', 'strength': 2})
+        # No hard hint: the query must still work if index creation fell back
+        self.assertNotIn('hint', city_call.kwargs)
+
+    def test_save_professional_retries_after_duplicate_key(self):
+        """Test that losing an insert race to a concurrent save returns the stored copy"""
+        self.db_manager.collection.find_one_and_update.side_effect = [
+            DuplicateKeyError('E11000 duplicate key'),
+            {'unique_id': 'existing'},
+        ]
+
+        unique_id = self.db_manager.save_professional({'linkedinId': 'abc', 'first_name': 'Jane'})
+
+        self.assertEqual(unique_id, 'existing')
+        self.assertEqual(self.db_manager.collection.find_one_and_update.call_count, 2)
+
+    def test_save_professionals_bulk_counts_duplicate_keys_as_existing(self):
+        """Test that duplicate-key errors in a bulk write count as already stored"""
+        self.db_manager.collection.bulk_write.side_effect = BulkWriteError(
+            {'nUpserted': 1, 'nMatched': 0, 'writeErrors': [{'index': 1, 'code': 11000}]}
+        )
+
+        saved = self.db_manager.save_professionals_bulk([{'linkedinId': 'a'}, {'linkedinId': 'b'}])
+
+        self.assertEqual(saved, 2)
+
+    def test_missing_linkedin_id_is_not_stored_as_null(self):
+        """Test that profiles without a LinkedIn ID leave the field out"""
+        self.db_manager.collection.bulk_write.return_value = Mock(upserted_count=1, matched_count=0)
+
+        self.db_manager.save_professionals_bulk([{'linkedinId': None, 'first_name': 'Jane'}])
+
+        operation = self.db_manager.collection.bulk_write.call_args.args[0][0]
+        self.assertNotIn('linkedinId', operation._doc['$setOnInsert'])
+
+if __name__ == "__main__":
+    unittest.main()
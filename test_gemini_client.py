@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the Gemini client
+Exercises model reuse and response parsing without calling the Gemini API.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import gemini_client
+from gemini_client import GeminiClient
+
+
+class TestGeminiClient(unittest.TestCase):
+    """Test cases for GeminiClient class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        patcher = patch.multiple('gemini_client.Config', GEMINI_API_KEY='test_key', GEMINI_MODEL='test-model')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        models = patch.dict(gemini_client._models, clear=True)
+        models.start()
+        self.addCleanup(models.stop)
+
+    def test_clients_share_one_model(self):
+        """Test that genai is configured and the model built once for repeated clients"""
+        with patch('gemini_client.genai') as mock_genai:
+            first, second = GeminiClient(), GeminiClient()
+
+        self.assertIs(first.model, second.model)
+        mock_genai.configure.assert_called_once_with(api_key='test_key')
+        mock_genai.GenerativeModel.assert_called_once_with('test-model')
+
+    def test_search_extracts_json_from_response(self):
+        """Test that the JSON block is pulled out of surrounding text and validated"""
+        with patch('gemini_client.genai') as mock_genai:
+            client = GeminiClient()
+        mock_genai.GenerativeModel.return_value.generate_content.return_value = Mock(text=(
+            'Here you go:\n{"professionals": ['
+            '{"first_name": "Jane", "last_name": "Doe", "company": "Acme", "job_title": "CTO", "city": "Austin"},'
+            '{"first_name": "J", "last_name": "Roe", "company": "Acme", "job_title": "CEO", "city": "Austin"}'
+            ']}\nThanks'
+        ))
+
+        professionals = client.search_professionals('Austin')
+
+        self.assertEqual([prof['first_name'] for prof in professionals], ['Jane'])
+        self.assertEqual(professionals[0]['source'], 'Gemini AI')
+
+    def test_valid_professionals_filters_incomplete_records(self):
+        """Test that records missing fields, in another city or with short names are dropped"""
+        with patch('gemini_client.genai'):
+            client = GeminiClient()
+        base = {'first_name': 'Jane', 'last_name': 'Doe', 'company': 'Acme', 'job_title': 'CTO', 'city': 'austin'}
+        professionals = [
+            base,
+            {**base, 'company': ''},
+            {**base, 'city': 'Boston'},
+            {**base, 'last_name': 'D'},
+            {key: value for key, value in base.items() if key != 'job_title'},
+        ]
+
+        self.assertEqual(client._valid_professionals(professionals, 'Austin'), [base])
+
+    def test_search_batch_returns_results_per_city(self):
+        """Test that a batch search runs every city and keys the results by city"""
+        with patch('gemini_client.genai'):
+            client = GeminiClient()
+        with patch.object(client, 'search_professionals', side_effect=lambda city, max_results: [city.lower()]) as search:
+            results = client.search_professionals_batch(['Austin', 'Boston', 'Denver'], max_results=5)
+
+        self.assertEqual(results, {'Austin': ['austin'], 'Boston': ['boston'], 'Denver': ['denver']})
+        self.assertEqual(search.call_count, 3)
+        self.assertEqual(client.search_professionals_batch([]), {})
+
+    def test_prompts_share_a_fixed_prefix(self):
+        """Test that only the end of the prompt depends on the city"""
+        with patch('gemini_client.genai') as mock_genai:
+            client = GeminiClient()
+        generate = mock_genai.GenerativeModel.return_value.generate_content
+        generate.return_value = Mock(text='{"professionals": []}')
+
+        client.search_professionals('Austin', max_results=5)
+        client.search_professionals('Boston', max_results=20)
+
+        austin, boston = (call.args[0] for call in generate.call_args_list)
+        self.assertTrue(austin.startswith(gemini_client.SEARCH_INSTRUCTIONS))
+        self.assertTrue(boston.startswith(gemini_client.SEARCH_INSTRUCTIONS))
+        self.assertNotIn('Austin', gemini_client.SEARCH_INSTRUCTIONS)
+        self.assertIn('City: Austin, USA', austin)
+
+if __name__ == "__main__":
+    unittest.main()
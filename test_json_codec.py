@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Test script for the JSON encoding helpers
+Checks that orjson and the standard library fallback produce the same results.
+"""
+
+import unittest
+from unittest.mock import patch
+import json_codec
+
+
+class TestJsonCodec(unittest.TestCase):
+    """Test cases for json_codec"""
+
+    SAMPLE = {'firstName': 'José', 'skills': [{'name': 'Python'}], 'premium': False, 'followerCount': None}
+
+    def test_round_trip(self):
+        """Test that encoded bytes decode back to the same object"""
+        encoded = json_codec.dumps(self.SAMPLE)
+
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(json_codec.loads(encoded), self.SAMPLE)
+        self.assertEqual(json_codec.loads(encoded.decode('utf-8')), self.SAMPLE)
+
+    def test_stdlib_fallback_matches(self):
+        """Test that the fallback without orjson gives identical output"""
+        encoded = json_codec.dumps(self.SAMPLE)
+        pretty = json_codec.dumps_pretty(self.SAMPLE)
+
+        with patch.object(json_codec, 'orjson', None):
+            self.assertEqual(json_codec.dumps(self.SAMPLE), encoded)
+            self.assertEqual(json_codec.loads(encoded), self.SAMPLE)
+            self.assertEqual(json_codec.dumps_pretty(self.SAMPLE), pretty)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ Test script for last run dataset functionality
 
 import os
 import sys
+import logging
 from dotenv import load_dotenv
 
 # Add the current directory to the Python path
@@ -95,4 +96,5 @@ def test_last_run_functionality():
     return True
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     test_last_run_functionality() 
\ No newline at end of file
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test script for the rate limiter
+"""
+
+import unittest
+from unittest.mock import patch
+from rate_limiter import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for RateLimiter class"""
+
+    @patch('rate_limiter.time.sleep')
+    @patch('rate_limiter.time.monotonic', return_value=100.0)
+    def test_burst_up_to_capacity_does_not_wait(self, mock_monotonic, mock_sleep):
+        """Test that a full bucket allows per_minute calls straight away"""
+        limiter = RateLimiter(per_minute=3)
+
+        for _ in range(3):
+            limiter.acquire()
+
+        mock_sleep.assert_not_called()
+
+    @patch('rate_limiter.time.sleep')
+    @patch('rate_limiter.time.monotonic')
+    def test_empty_bucket_waits_for_refill(self, mock_monotonic, mock_sleep):
+        """Test that a call on an empty bucket sleeps until a token is refilled"""
+        clock = [100.0]
+        mock_monotonic.side_effect = lambda: clock[0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+        mock_sleep.side_effect = sleep
+
+        limiter = RateLimiter(per_minute=60)  # One token per second
+        for _ in range(60):
+            limiter.acquire()
+        limiter.acquire()
+
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
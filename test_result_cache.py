@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite result cache
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for ResultCache class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(os.path.join(self.tmp.name, 'nested', 'cache.sqlite'), ttl=60)
+
+    def tearDown(self):
+        """Clean up after tests"""
+        self.tmp.cleanup()
+
+    def test_set_and_get(self):
+        """Test that stored payloads are returned and missing keys give None"""
+        key = ResultCache.make_key('actor', {'locations': ['Austin']})
+        self.cache.set(key, [{'first_name': 'Jane'}], {'actor_id': 'actor'})
+
+        self.assertEqual(self.cache.get(key), [{'first_name': 'Jane'}])
+        self.assertIsNone(self.cache.get('missing'))
+
+    def test_make_key_ignores_dict_order(self):
+        """Test that keys do not depend on dict insertion order"""
+        self.assertEqual(
+            ResultCache.make_key('actor', {'a': 1, 'b': 2}),
+            ResultCache.make_key('actor', {'b': 2, 'a': 1})
+        )
+
+    @patch('result_cache.time.time')
+    def test_expired_entries_are_ignored(self, mock_time):
+        """Test that entries older than the TTL are treated as missing"""
+        mock_time.return_value = 1000.0
+        self.cache.set('key', [1])
+
+        mock_time.return_value = 1059.0
+        self.assertEqual(self.cache.get('key'), [1])
+        mock_time.return_value = 1061.0
+        self.assertIsNone(self.cache.get('key'))
+
+    @patch('result_cache.time.time')
+    def test_set_deletes_expired_entries(self, mock_time):
+        """Test that storing a result removes entries past the TTL, so the file does not grow without bound"""
+        mock_time.return_value = 1000.0
+        self.cache.set('old', [1])
+        self.cache.set('fresh', [2])
+
+        mock_time.return_value = 1061.0
+        self.cache.set('new', [3])
+
+        with self.cache._connect() as conn:
+            keys = {row[0] for row in conn.execute("SELECT key FROM results")}
+        self.assertEqual(keys, {'new'})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ This script tests the credit scoring functionality using Google Gemini AI.
 import json
 import unittest
 from unittest.mock import Mock, patch, MagicMock
+from google.api_core.exceptions import ResourceExhausted
 from score_algorithm import ProfessionalCreditScorer
 from database import DatabaseManager
 
@@ -257,6 +258,56 @@ class TestProfessionalCreditScorer(unittest.TestCase):
         self.assertIn("Tech Corp", prompt)
         self.assertIn("Austin", prompt)
         self.assertIn("batch 1 of 1", prompt)
+    
+    @patch('time.sleep')
+    @patch('google.generativeai.GenerativeModel')
+    @patch('score_algorithm.DatabaseManager')
+    def test_analyze_professional_database_runs_batches_without_waiting(self, mock_db_manager, mock_genai_model, mock_sleep):
+        """Test that every batch is analyzed, in order, with no fixed wait between them"""
+        mock_response = Mock()
+        mock_response.text = json.dumps({
+            "analysis_summary": {"total_professionals_analyzed": 75, "average_years_experience": 4.0},
+            "experience_distribution": {},
+            "career_insights": {}
+        })
+        mock_genai_model.return_value.generate_content.return_value = mock_response
+        mock_db_manager.return_value.get_all_professionals.return_value = [
+            {"unique_id": str(i), "first_name": "Jane", "last_name": "Doe"} for i in range(160)
+        ]
+        
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test_key'}):
+            scorer = ProfessionalCreditScorer()
+            result = scorer.analyze_professional_database()
+        
+        self.assertEqual(mock_genai_model.return_value.generate_content.call_count, 3)
+        self.assertEqual(result["analysis_summary"]["total_batches_processed"], 3)
+        self.assertEqual([batch["batch_number"] for batch in result["batch_details"]], [1, 2, 3])
+        mock_sleep.assert_not_called()
+    
+    @patch('time.sleep')
+    def test_rate_limited_request_waits_for_retry_delay(self, mock_sleep):
+        """Test that a rate limit error is retried after the delay Gemini asks for"""
+        mock_response = Mock()
+        mock_response.text = json.dumps({
+            "analysis_summary": {}, "experience_distribution": {}, "career_insights": {}
+        })
+        self.scorer.model = Mock()
+        self.scorer.model.generate_content.side_effect = [
+            ResourceExhausted("429 Quota exceeded. Please retry in 12.5s."),
+            mock_response
+        ]
+        
+        analysis = self.scorer._get_gemini_analysis("prompt")
+        
+        self.assertIn("analysis_summary", analysis)
+        mock_sleep.assert_called_once_with(12.5)
+    
+    def test_retry_delay_reads_retry_info(self):
+        """Test that the structured RetryInfo delay is preferred and a full window is the default"""
+        retry_info = Mock(retry_delay=Mock(seconds=41, nanos=500000000))
+        
+        self.assertEqual(ProfessionalCreditScorer._retry_delay(ResourceExhausted("429", details=[retry_info])), 41.5)
+        self.assertEqual(ProfessionalCreditScorer._retry_delay(ResourceExhausted("429")), 60.0)
 
 
 def test_manual_experience_calculation():